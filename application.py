@@ -1,16 +1,18 @@
-from config import Config
 from modules import timer
-from modules.data import Box, AbstractData, Grid, QTree
+from modules.data import Box, AbstractData
+from modules.flow import FlowFields
+from modules.graph import Graph
+from modules.hierarchy import Hierarchy
 from modules.image import Image
-from modules.pathfinder import PathfinderInfo, AbstractPathfinder, AStar
+from modules.options import SearchOptions
+from modules.pathfinder import PathfinderInfo, AbstractPathfinder, AStar, ARAStar, BidirectionalAStar, DialAStar, FlowFieldPathfinder, GraphAStar, GridAStar, HPAStar, JPS, LazyThetaStar
+from modules.risk import RiskMap
+from modules.storage import Storage
 
 
-# TODO Create static graph
-# TODO Jump Point Search (with grid)
-# TODO Risk maps by different criteria
 # TODO Path to special format
 
-def print_pathfinding_info(data: AbstractData, info: PathfinderInfo, distance: AbstractData.DistanceMethod, time):
+def print_pathfinding_info(data: AbstractData, info: PathfinderInfo, time):
 
     safe_elements_length = len(data.elements([Box.State.SAFE]))
     path_length = info.path_length()
@@ -20,28 +22,42 @@ def print_pathfinding_info(data: AbstractData, info: PathfinderInfo, distance: A
     print(f'\n'
           f'Pathfinder: {info.pathfinder_name}\n'
           f'Data: {type(data).__name__}\n'
-          f'Distance: {distance.name}\n'
-          f'Allow diagonal: {Config.Path.ALLOW_DIAGONAL}\n'
+          f'Distance: {info.options.distance_method.name}\n'
+          f'Allow diagonal: {info.options.allow_diagonal}\n'
           f'Path length: {path_length}\n'
           f'Trajectory length: {info.trajectory_length():.3f}\n'
           f'Visited: {visited_length} ({visited_percent:.3f}% of safe elements)\n'
+          f'Expanded: {info.expanded}\n'
           f'Time: {time} ms')
 
+    if info.bound is not None:
+        print(f'Suboptimality bound: {info.bound:.3f}')
 
-def pathfinding(image: Image, pathfinder: AbstractPathfinder, distance: AbstractData.DistanceMethod, save_path):
-    pathfinder.data.distance_method = distance
+    if info.iterations is not None:
+        print(f'Iterations: {info.iterations}')
 
+    if info.sight_checks is not None:
+        print(f'Sight checks: {info.sight_checks}')
+
+    if info.frontiers is not None:
+        for name, frontier_length in info.frontiers.items():
+            print(f'Visited {name}: {frontier_length} ({frontier_length / safe_elements_length * 100:.3f}% of safe elements)')
+
+
+def pathfinding(image: Image, pathfinder: AbstractPathfinder, save_path=None):
     start_time = timer.now()
     pathfinder_info: PathfinderInfo = pathfinder.search()
     end_time = timer.now() - start_time
 
-    print_pathfinding_info(pathfinder.data, pathfinder_info, distance, end_time)
-    image.save(pathfinder.data, save_path, pathfinder_info)
+    print_pathfinding_info(pathfinder.data, pathfinder_info, end_time)
 
+    if save_path is not None:
+        image.save(pathfinder.data, save_path, pathfinder_info)
 
-def create_grid(image):
+
+def create_grid(image, storage: Storage):
     start_time = timer.now()
-    grid = Grid(image.pixels)
+    grid = storage.grid(image.path, image.pixels)
     end_time = timer.now() - start_time
 
     print(f'Grid creation: {end_time} ms')
@@ -50,10 +66,9 @@ def create_grid(image):
     return grid
 
 
-def create_qtree(image):
+def create_qtree(image, storage: Storage):
     start_time = timer.now()
-    qtree = QTree(image.pixels, 0, 0, image.width(), image.height())
-    qtree.divide()
+    qtree = storage.qtree(image.path, image.pixels)
     end_time = timer.now() - start_time
 
     print(f'QTree creation: {end_time} ms')
@@ -62,25 +77,125 @@ def create_qtree(image):
     return qtree
 
 
+def create_graph(image, data: AbstractData, storage: Storage):
+    start_time = timer.now()
+    graph = storage.graph(image.path, data)
+    end_time = timer.now() - start_time
+
+    print(f'{type(data).__name__} graph creation: {end_time} ms')
+
+    return graph
+
+
+def create_landmarks(image, graph: Graph, storage: Storage):
+    start_time = timer.now()
+    graph.landmarks = storage.landmarks(image.path, graph)
+    end_time = timer.now() - start_time
+
+    print(f'{type(graph.data).__name__} landmarks creation: {end_time} ms')
+
+
+def create_risk_map(image, data: AbstractData):
+    start_time = timer.now()
+    risk = RiskMap(data, [(RiskMap.proximity(image.pixels, 150), 4.0)])
+    end_time = timer.now() - start_time
+
+    print(f'{type(data).__name__} risk map creation: {end_time} ms')
+
+    return risk
+
+
+def create_hierarchy(graph: Graph):
+    start_time = timer.now()
+    hierarchy = Hierarchy(graph)
+    end_time = timer.now() - start_time
+
+    print(f'{type(graph.data).__name__} hierarchy creation: {end_time} ms')
+
+    return hierarchy
+
+
 def main():
     image = Image('images/big_map.png')
+    storage = Storage()
 
-    grid = create_grid(image)
-    qtree = create_qtree(image)
+    grid = create_grid(image, storage)
+    qtree = create_qtree(image, storage)
 
     start = 4990, 5035
     end = 880, 1510
+    options = SearchOptions(distance_method=AbstractData.DistanceMethod.EUCLIDIAN)
 
     pathfinding(image=image,
-                pathfinder=AStar(grid, start, end),
-                distance=AbstractData.DistanceMethod.EUCLIDIAN,
+                pathfinder=AStar(grid, start, end, options),
                 save_path='images/grid/grid_astar_euclidian_diagonal_smooth.png')
 
     pathfinding(image=image,
-                pathfinder=AStar(qtree, start, end),
-                distance=AbstractData.DistanceMethod.EUCLIDIAN,
+                pathfinder=AStar(qtree, start, end, options),
                 save_path='images/qtree/qtree_astar_euclidian_diagonal_smooth.png')
 
+    pathfinding(image=image,
+                pathfinder=GridAStar(grid, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=AStar(grid, start, end, SearchOptions(distance_method=AbstractData.DistanceMethod.EUCLIDIAN, heuristic_weight=1.2)))
+
+    pathfinding(image=image,
+                pathfinder=ARAStar(grid, start, end, SearchOptions(distance_method=AbstractData.DistanceMethod.EUCLIDIAN, heuristic_weight=2.0)))
+
+    pathfinding(image=image,
+                pathfinder=BidirectionalAStar(grid, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=BidirectionalAStar(qtree, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=JPS(grid, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=LazyThetaStar(grid, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=LazyThetaStar(qtree, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=FlowFieldPathfinder(FlowFields(grid, options), start, end))
+
+    pathfinding(image=image,
+                pathfinder=FlowFieldPathfinder(FlowFields(qtree, options), start, end))
+
+    grid_graph = create_graph(image, grid, storage)
+    qtree_graph = create_graph(image, qtree, storage)
+
+    pathfinding(image=image,
+                pathfinder=GraphAStar(grid_graph, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=GraphAStar(qtree_graph, start, end, options))
+
+    create_landmarks(image, grid_graph, storage)
+    create_landmarks(image, qtree_graph, storage)
+
+    pathfinding(image=image,
+                pathfinder=GraphAStar(grid_graph, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=GraphAStar(qtree_graph, start, end, options))
+
+    grid_hierarchy = create_hierarchy(grid_graph)
+    qtree_hierarchy = create_hierarchy(qtree_graph)
+
+    pathfinding(image=image,
+                pathfinder=HPAStar(grid_hierarchy, start, end, options))
+
+    pathfinding(image=image,
+                pathfinder=HPAStar(qtree_hierarchy, start, end, options))
+
+    grid.risk = create_risk_map(image, grid)
+
+    pathfinding(image=image,
+                pathfinder=DialAStar(grid_graph, start, end, options))
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,791 @@
+import os
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import PIL.Image
+from pqdict import pqdict
+
+from config import Config
+from modules import timer
+from modules.batch import Batch
+from modules.cache import QueryCache
+from modules.components import Components
+from modules.data import AbstractData, Box, Grid, QTree, LinearQTree
+from modules.flow import FlowFields
+from modules.graph import Graph
+from modules.heap import IndexedHeap
+from modules.hierarchy import Hierarchy
+from modules.image import Image
+from modules.occupancy import Occupancy
+from modules.options import SearchOptions
+from modules.pathfinder import PathfinderInfo, AStar, ARAStar, BidirectionalAStar, DialAStar, FlowFieldPathfinder, GraphAStar, GridAStar, HPAStar, JPS, LazyThetaStar
+from modules.risk import RiskMap
+from modules.storage import Storage
+
+
+def measure(function, *args):
+    start_time = timer.now()
+    result = function(*args)
+    end_time = timer.now() - start_time
+
+    return result, end_time
+
+
+def grid_creation(image):
+    Config.Grid.VECTORIZED = False
+    per_cell_grid, per_cell_time = measure(Grid, image.pixels)
+
+    Config.Grid.VECTORIZED = True
+    vectorized_grid, vectorized_time = measure(Grid, image.pixels)
+
+    assert np.array_equal(per_cell_grid.states, vectorized_grid.states), 'Grid states mismatch'
+
+    print(f'\n'
+          f'Grid creation ({per_cell_grid.rows}x{per_cell_grid.columns})\n'
+          f'Per cell: {per_cell_time} ms\n'
+          f'Vectorized: {vectorized_time} ms')
+
+
+def qtree_creation(image):
+    def create():
+        qtree = QTree(image.pixels, 0, 0, image.width(), image.height())
+        qtree.divide()
+        return qtree
+
+    Config.QTree.INTEGRAL = False
+    slice_qtree, slice_time = measure(create)
+
+    Config.QTree.INTEGRAL = True
+    integral_qtree, integral_time = measure(create)
+
+    slice_boxes = [(box.x, box.y, box.w, box.h, box.state) for box in slice_qtree.boxes()]
+    integral_boxes = [(box.x, box.y, box.w, box.h, box.state) for box in integral_qtree.boxes()]
+
+    assert slice_boxes == integral_boxes, 'QTree leaves mismatch'
+
+    print(f'\n'
+          f'QTree creation ({len(integral_boxes)} leaves)\n'
+          f'Slice scan: {slice_time} ms\n'
+          f'Integral image: {integral_time} ms')
+
+
+def measure_memory(function, *args):
+    tracemalloc.start()
+    result = function(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, current, peak
+
+
+def qtree_layout(image):
+    def create(qtree_type):
+        qtree = qtree_type(image.pixels, 0, 0, image.width(), image.height())
+        qtree.divide()
+        return qtree
+
+    print(f'\nQTree layout')
+
+    for qtree_type in [QTree, LinearQTree]:
+        qtree, build_time = measure(create, qtree_type)
+        _, current, peak = measure_memory(create, qtree_type)
+
+        print(f'{qtree_type.__name__}: {len(qtree.elements())} leaves, '
+              f'build {build_time} ms, '
+              f'retained {current / 1024:.1f} KiB, '
+              f'peak {peak / 1024 / 1024:.1f} MiB')
+
+
+def safe_pairs(data, count, seed=0):
+    random = np.random.default_rng(seed)
+    centers = [box.center() for box in data.boxes() if box.state == Box.State.SAFE]
+    indexes = random.integers(0, len(centers), (count, 2))
+
+    return [(centers[start], centers[end]) for start, end in indexes]
+
+
+def path_cost(data, info):
+    if info.path is None:
+        return None
+
+    return sum(data.cost(current, following) for current, following in zip(info.path, info.path[1:]))
+
+
+def same_cost(cost0, cost1):
+    if cost0 is None or cost1 is None:
+        return cost0 is None and cost1 is None
+
+    return abs(cost0 - cost1) < 1e-6
+
+
+def static_graph(data, count=100):
+    pairs = safe_pairs(data, count)
+    graph, compile_time = measure(Graph, data)
+
+    infos, astar_time = measure(lambda: [AStar(data, start, end).search() for start, end in pairs])
+    graph_infos, graph_time = measure(lambda: [GraphAStar(graph, start, end).search() for start, end in pairs])
+
+    for info, graph_info in zip(infos, graph_infos):
+        assert same_cost(path_cost(data, info), path_cost(graph, graph_info)), 'Path cost mismatch'
+
+    print(f'\n'
+          f'Static graph ({type(data).__name__}, {len(graph.indices)} edges, {count} queries)\n'
+          f'Compilation: {compile_time} ms\n'
+          f'AStar: {astar_time / count:.3f} ms per query\n'
+          f'GraphAStar: {graph_time / count:.3f} ms per query')
+
+
+def jump_point_search(grid, count=100):
+    pairs = safe_pairs(grid, count)
+
+    infos, astar_time = measure(lambda: [AStar(grid, start, end).search() for start, end in pairs])
+    jps_infos, jps_time = measure(lambda: [JPS(grid, start, end).search() for start, end in pairs])
+
+    for info, jps_info in zip(infos, jps_infos):
+        assert same_cost(path_cost(grid, info), path_cost(grid, jps_info)), 'Path cost mismatch'
+
+    astar_expanded = sum(info.expanded for info in infos)
+    jps_expanded = sum(info.expanded for info in jps_infos)
+
+    print(f'\n'
+          f'Jump point search (Grid, {count} queries)\n'
+          f'AStar: {astar_expanded / count:.1f} expanded, {astar_time / count:.3f} ms per query\n'
+          f'JPS: {jps_expanded / count:.1f} expanded, {jps_time / count:.3f} ms per query')
+
+
+def bidirectional_search(data, count=100):
+    pairs = safe_pairs(data, count)
+
+    infos, astar_time = measure(lambda: [AStar(data, start, end).search() for start, end in pairs])
+    bidirectional_infos, bidirectional_time = measure(lambda: [BidirectionalAStar(data, start, end).search() for start, end in pairs])
+
+    for info, bidirectional_info in zip(infos, bidirectional_infos):
+        assert same_cost(path_cost(data, info), path_cost(data, bidirectional_info)), 'Path cost mismatch'
+
+    astar_visited = sum(info.visited_length() for info in infos)
+    bidirectional_visited = sum(info.visited_length() for info in bidirectional_infos)
+    astar_expanded = sum(info.expanded for info in infos)
+    bidirectional_expanded = sum(info.expanded for info in bidirectional_infos)
+
+    print(f'\n'
+          f'Bidirectional search ({type(data).__name__}, {count} queries)\n'
+          f'AStar: {astar_visited / count:.1f} visited, {astar_expanded / count:.1f} expanded, {astar_time / count:.3f} ms per query\n'
+          f'BidirectionalAStar: {bidirectional_visited / count:.1f} visited, {bidirectional_expanded / count:.1f} expanded, '
+          f'{bidirectional_time / count:.3f} ms per query')
+
+
+def hierarchical_search(image, count=50, size=20, cells=20):
+    min_size, cluster_size, corridor = Config.Grid.MIN_SIZE, Config.Hierarchy.CLUSTER_SIZE, Config.Hierarchy.CORRIDOR
+    Config.Grid.MIN_SIZE = size
+    Config.Hierarchy.CLUSTER_SIZE = size * cells
+
+    grid = Grid(image.pixels)
+    graph = Graph(grid)
+    hierarchy, build_time = measure(Hierarchy, graph)
+    pairs = safe_pairs(graph, count)
+
+    infos, flat_time = measure(lambda: [GraphAStar(graph, start, end).search() for start, end in pairs])
+    optimal_costs = [path_cost(graph, info) for info in infos]
+
+    print(f'\n'
+          f'Hierarchical search (Grid {grid.rows}x{grid.columns}, '
+          f'{sum(len(entrances) for entrances in hierarchy.entrances.values())} entrances, {count} queries)\n'
+          f'Hierarchy build: {build_time} ms\n'
+          f'GraphAStar: {sum(info.expanded for info in infos) / count:.1f} expanded, {flat_time / count:.3f} ms per query')
+
+    for weight, corridor in [(1.0, False), (1.5, False), (1.0, True)]:
+        Config.Hierarchy.CORRIDOR = corridor
+        hierarchical_infos, hierarchical_time = measure(lambda: [HPAStar(hierarchy, start, end, SearchOptions(heuristic_weight=weight)).search() for start, end in pairs])
+        ratios = [path_cost(graph, info) / cost for info, cost in zip(hierarchical_infos, optimal_costs) if cost]
+        bounds = [info.bound for info in hierarchical_infos if info.bound is not None]
+
+        for info, cost in zip(hierarchical_infos, optimal_costs):
+            assert info.bound is None or not cost or path_cost(graph, info) <= info.bound * cost + 1e-6, 'Bound violated'
+
+        print(f'HPAStar (weight {weight}, corridor {corridor}): {sum(info.expanded for info in hierarchical_infos) / count:.1f} expanded, '
+              f'{hierarchical_time / count:.3f} ms per query, '
+              f'cost ratio {np.mean(ratios):.3f} mean, {np.max(ratios):.3f} max, '
+              f'bound {np.mean(bounds):.3f} mean, {np.max(bounds):.3f} max')
+
+    Config.Grid.MIN_SIZE, Config.Hierarchy.CLUSTER_SIZE, Config.Hierarchy.CORRIDOR = min_size, cluster_size, corridor
+
+
+def landmark_heuristic(image, count=50, size=20):
+    min_size = Config.Grid.MIN_SIZE
+    Config.Grid.MIN_SIZE = size
+
+    storage = Storage(tempfile.mkdtemp())
+    grid = Grid(image.pixels)
+    graph = Graph(grid)
+    landmarks, build_time = measure(storage.landmarks, image.path, graph)
+    _, load_time = measure(storage.landmarks, image.path, graph)
+    pairs = safe_pairs(grid, count)
+
+    print(f'\n'
+          f'Landmark heuristic (Grid {grid.rows}x{grid.columns}, {len(landmarks)} landmarks, {count} queries)\n'
+          f'Tables: build {build_time} ms, load {load_time} ms')
+
+    for name, pathfinder_type, data in [('AStar', AStar, grid), ('GraphAStar', GraphAStar, graph)]:
+        data.landmarks = None
+        infos, euclidian_time = measure(lambda: [pathfinder_type(data, start, end).search() for start, end in pairs])
+
+        data.landmarks = landmarks
+        landmark_infos, landmark_time = measure(lambda: [pathfinder_type(data, start, end).search() for start, end in pairs])
+        data.landmarks = None
+
+        for info, landmark_info in zip(infos, landmark_infos):
+            assert same_cost(path_cost(data, info), path_cost(data, landmark_info)), 'Path cost mismatch'
+
+        print(f'{name}: euclidian {sum(info.expanded for info in infos) / count:.1f} expanded, '
+              f'{euclidian_time / count:.3f} ms per query, '
+              f'landmarks {sum(info.expanded for info in landmark_infos) / count:.1f} expanded, '
+              f'{landmark_time / count:.3f} ms per query')
+
+    Config.Grid.MIN_SIZE = min_size
+
+
+def shared_goal(data, agents=200):
+    options = SearchOptions(enable_smoothing=False)
+    pairs = safe_pairs(data, agents)
+    end = pairs[0][1]
+
+    infos, astar_time = measure(lambda: [AStar(data, start, end, options).search() for start, _ in pairs])
+
+    fields = FlowFields(data, options)
+    _, field_time = measure(fields.field, data.get(*end))
+    flow_infos, flow_time = measure(lambda: [FlowFieldPathfinder(fields, start, end).search() for start, _ in pairs])
+
+    for info, flow_info in zip(infos, flow_infos):
+        assert same_cost(path_cost(data, info), path_cost(data, flow_info)), 'Path cost mismatch'
+
+    print(f'\n'
+          f'Shared goal ({type(data).__name__}, {agents} agents)\n'
+          f'AStar: {astar_time} ms\n'
+          f'Flow field: {field_time} ms build, {flow_time} ms extraction, {fields.hits} hits, {fields.misses} misses')
+
+
+def anytime_search(data, count=10, weight=2.0, deadlines=(0, 50, 200)):
+    pairs = safe_pairs(data, count)
+    options = SearchOptions(enable_smoothing=False)
+    infos, search_time = measure(lambda: [AStar(data, start, end, options).search() for start, end in pairs])
+    costs = [path_cost(data, info) for info in infos]
+
+    weighted_options = SearchOptions(enable_smoothing=False, heuristic_weight=weight)
+    weighted_infos, weighted_time = measure(lambda: [AStar(data, start, end, weighted_options).search() for start, end in pairs])
+
+    print(f'\n'
+          f'Anytime search ({type(data).__name__}, {count} queries)\n'
+          f'AStar: {search_time} ms\n'
+          f'Weighted AStar ({weight}): {weighted_time} ms, {suboptimality(data, weighted_infos, costs)}')
+
+    for deadline in deadlines:
+        anytime_infos, anytime_time = measure(lambda: [ARAStar(data, start, end, weighted_options, deadline).search() for start, end in pairs])
+
+        for info, cost in zip(anytime_infos, costs):
+            assert (info.path is None) == (cost is None), 'Path mismatch'
+            assert info.path is None or path_cost(data, info) <= info.bound * cost + 1e-6, 'Bound violated'
+
+        iterations = sum(info.iterations for info in anytime_infos if info.iterations is not None)
+        print(f'ARAStar ({deadline} ms deadline): {anytime_time} ms, {suboptimality(data, anytime_infos, costs)}, {iterations} iterations')
+
+
+def suboptimality(data, infos, costs):
+    ratios = [path_cost(data, info) / cost for info, cost in zip(infos, costs) if cost]
+    bounds = [info.bound for info in infos if info.bound is not None]
+
+    return f'cost ratio {max(ratios, default=1):.3f}, bound {max(bounds, default=1):.3f}'
+
+
+def repeated_queries(data, distinct=20, count=200):
+    random = np.random.default_rng(0)
+    pairs = safe_pairs(data, distinct)
+    queries = []
+
+    for index in random.integers(0, distinct, count).tolist():
+        start, end = pairs[index]
+        start_box, end_box = data.boxes([data.get(*start), data.get(*end)])
+
+        start = int(random.integers(start_box.x, start_box.x + start_box.w)), int(random.integers(start_box.y, start_box.y + start_box.h))
+        end = int(random.integers(end_box.x, end_box.x + end_box.w)), int(random.integers(end_box.y, end_box.y + end_box.h))
+        queries.append((start, end))
+
+    options = SearchOptions(enable_smoothing=True)
+    infos, search_time = measure(lambda: [AStar(data, start, end, options).search() for start, end in queries])
+
+    cache = QueryCache(data, AStar)
+    cached_infos, cache_time = measure(lambda: [cache.search(start, end, options) for start, end in queries])
+
+    for info, cached_info in zip(infos, cached_infos):
+        assert same_cost(path_cost(data, info), path_cost(data, cached_info)), 'Path cost mismatch'
+        assert info.path is None or cached_info.points[0] == info.end and cached_info.points[-1] == info.start, 'Endpoint mismatch'
+
+    print(f'\n'
+          f'Repeated queries ({type(data).__name__}, {distinct} distinct, {count} queries)\n'
+          f'AStar: {search_time} ms\n'
+          f'Query cache: {cache_time} ms, {cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions')
+
+
+def unreachable_queries(data, count=20):
+    options = SearchOptions()
+    components, label_time = measure(Components, data, options)
+    pairs = [(start, end) for start, end in safe_pairs(data, count * 50)
+             if not components.connected(data.get(*start), data.get(*end))][:count]
+
+    if not pairs:
+        return
+
+    Config.Path.COMPONENTS = False
+    infos, search_time = measure(lambda: [AStar(data, start, end, options).search() for start, end in pairs])
+
+    Config.Path.COMPONENTS = True
+    Components.shared(data, options)
+    rejected_infos, rejected_time = measure(lambda: [AStar(data, start, end, options).search() for start, end in pairs])
+
+    assert all(info.path is None for info in infos + rejected_infos), 'Unreachable path found'
+
+    print(f'\n'
+          f'Unreachable queries ({type(data).__name__}, {components.count} components, {len(pairs)} queries)\n'
+          f'Labeling: {label_time} ms\n'
+          f'AStar: {search_time / len(pairs):.3f} ms per query, {sum(info.expanded for info in infos) / len(pairs):.1f} expanded\n'
+          f'AStar with components: {rejected_time / len(pairs):.3f} ms per query')
+
+
+def component_update(image, count=10, size=300):
+    options = SearchOptions()
+    pixels = image.pixels.copy()
+    data = Grid(pixels)
+    Components.shared(data, options)
+
+    random = np.random.default_rng(0)
+    corners = random.integers(0, [image.width() - size, image.height() - size], (count, 2)).tolist()
+    pairs = safe_pairs(data, count)
+
+    unchanged_time = 0
+    changed_time = 0
+    relabel_time = 0
+
+    def query(start, end):
+        return Components.shared(data, options).connected(data.get(*start), data.get(*end))
+
+    for (x, y), (start, end) in zip(corners, pairs):
+        data.update(x, y, size, size)
+        _, time = measure(query, start, end)
+        unchanged_time += time
+
+        pixels[y:y + size, x:x + size] = Config.Color.UNSAFE if random.random() < 0.5 else Config.Color.SAFE
+        data.update(x, y, size, size)
+        connected, time = measure(query, start, end)
+        changed_time += time
+
+        fresh, time = measure(Components, data, options)
+        relabel_time += time
+
+        assert connected == fresh.connected(data.get(*start), data.get(*end)), 'Connectivity mismatch'
+        assert Components.shared(data, options).count == fresh.count, 'Component count mismatch'
+
+    print(f'\n'
+          f'Component update ({count} regions of {size}x{size})\n'
+          f'Unchanged region then query: {unchanged_time / count:.3f} ms\n'
+          f'Changed region then query: {changed_time / count:.3f} ms\n'
+          f'Full relabel: {relabel_time / count:.3f} ms')
+
+
+def risk_search(data, layer, count=100):
+    graph = Graph(data)
+    pairs = safe_pairs(data, count)
+
+    binary_infos, binary_time = measure(lambda: [GraphAStar(graph, start, end).search() for start, end in pairs])
+
+    data.risk, aggregate_time = measure(RiskMap, data, [(layer, 4.0)])
+    risk_infos, risk_time = measure(lambda: [GraphAStar(graph, start, end).search() for start, end in pairs])
+    dial_infos, dial_time = measure(lambda: [DialAStar(graph, start, end).search() for start, end in pairs])
+
+    for risk_info, dial_info in zip(risk_infos, dial_infos):
+        risk_cost, dial_cost = path_cost(graph, risk_info), path_cost(graph, dial_info)
+
+        assert (risk_cost is None) == (dial_cost is None), 'Path existence mismatch'
+        assert risk_cost is None or dial_cost <= risk_cost + len(dial_info.path) / Config.Risk.RESOLUTION + 1e-6, 'Path cost mismatch'
+        assert risk_cost is None or dial_cost <= dial_info.bound * risk_cost + 1e-6, 'Bound violated'
+
+    found = [info for info in binary_infos if info.path is not None]
+    data.risk = None
+
+    print(f'\n'
+          f'Risk search ({type(data).__name__}, {len(graph)} elements, {count} queries)\n'
+          f'Aggregation: {aggregate_time} ms\n'
+          f'GraphAStar binary: {binary_time / count:.3f} ms per query, '
+          f'{sum(info.expanded for info in binary_infos) / count:.1f} expanded, {np.mean([info.trajectory_length() for info in found]):.1f} mean length\n'
+          f'GraphAStar weighted: {risk_time / count:.3f} ms per query, '
+          f'{sum(info.expanded for info in risk_infos) / count:.1f} expanded\n'
+          f'DialAStar weighted: {dial_time / count:.3f} ms per query, '
+          f'{sum(info.expanded for info in dial_infos) / count:.1f} expanded, '
+          f'{np.mean([info.trajectory_length() for info in dial_infos if info.path is not None]):.1f} mean length, '
+          f'{max([info.bound for info in dial_infos if info.path is not None], default=1.0):.3f} bound')
+
+
+def neighbour_generation(grid):
+    elements = np.arange(grid.rows * grid.columns)
+    grid.neighbours(0)
+
+    neighbours, neighbours_time = measure(lambda: [grid.neighbours(element) for element in elements.tolist()])
+    (sources, targets, costs), frontier_time = measure(grid.frontier, elements)
+
+    assert sum(len(element_neighbours) for element_neighbours in neighbours) == len(targets), 'Neighbour count mismatch'
+
+    print(f'\n'
+          f'Neighbour generation (Grid {grid.rows}x{grid.columns}, {len(targets)} edges)\n'
+          f'Per element: {neighbours_time} ms\n'
+          f'Frontier batch: {frontier_time} ms')
+
+
+def open_list(grid, count=50, operations=200000):
+    random = np.random.default_rng(0)
+    size = grid.rows * grid.columns
+    nodes = random.integers(0, size, operations).tolist()
+    priorities = random.random(operations).tolist()
+
+    def pqdict_operations():
+        queue = pqdict()
+
+        for index, (node, priority) in enumerate(zip(nodes, priorities)):
+            if node not in queue or priority < queue[node]:
+                queue[node] = priority
+
+            if index % 4 == 0:
+                queue.popitem()
+
+    def indexed_operations():
+        heap = IndexedHeap.shared(size)
+
+        for index, (node, priority) in enumerate(zip(nodes, priorities)):
+            if heap.position[node] < 0 or priority < heap.priority[node]:
+                heap.touch(node, priority, -1)
+                heap.push(node, priority)
+
+            if index % 4 == 0:
+                heap.pop()
+
+    _, pqdict_time = measure(pqdict_operations)
+    _, indexed_time = measure(indexed_operations)
+    _, reset_time = measure(IndexedHeap.shared, size)
+
+    pairs = safe_pairs(grid, count)
+
+    infos, astar_time = measure(lambda: [AStar(grid, start, end).search() for start, end in pairs])
+    grid_infos, grid_time = measure(lambda: [GridAStar(grid, start, end).search() for start, end in pairs])
+
+    for info, grid_info in zip(infos, grid_infos):
+        assert same_cost(path_cost(grid, info), path_cost(grid, grid_info)), 'Path cost mismatch'
+
+    print(f'\n'
+          f'Open list (Grid {grid.rows}x{grid.columns}, {operations} operations, {count} queries)\n'
+          f'pqdict: {pqdict_time} ms, AStar {astar_time / count:.3f} ms per query\n'
+          f'IndexedHeap: {indexed_time} ms, reset {reset_time} ms, GridAStar {grid_time / count:.3f} ms per query')
+
+
+def mixed_queries(grid, count=25, threads=4):
+    pairs = safe_pairs(grid, count)
+    options = [SearchOptions(allow_diagonal=allow_diagonal, enable_smoothing=False, distance_method=distance_method)
+               for allow_diagonal in [True, False] for distance_method in AbstractData.DistanceMethod]
+    queries = [(start, end, query_options) for start, end in pairs for query_options in options]
+
+    def search(query):
+        start, end, query_options = query
+        info = GridAStar(grid, start, end, query_options).search()
+
+        return path_cost(grid, info) if info.path is not None else None, info.expanded
+
+    sequential, sequential_time = measure(lambda: [search(query) for query in queries])
+
+    with ThreadPoolExecutor(threads) as executor:
+        concurrent, concurrent_time = measure(lambda: list(executor.map(search, queries)))
+
+    assert sequential == concurrent, 'Concurrent query mismatch'
+
+    print(f'\n'
+          f'Mixed queries (Grid, {len(options)} options, {len(queries)} queries, {threads} threads)\n'
+          f'Sequential: {sequential_time / len(queries):.3f} ms per query\n'
+          f'Concurrent: {concurrent_time / len(queries):.3f} ms per query')
+
+
+def batch_queries(data, count=400):
+    pairs = safe_pairs(data, count)
+
+    _, serial_time = measure(lambda: [AStar(data, start, end).search() for start, end in pairs])
+
+    with Batch(data, AStar) as batch:
+        _, batch_time = measure(batch.search, pairs)
+
+    print(f'\n'
+          f'Batch queries ({type(data).__name__}, {count} queries, {os.cpu_count()} processes)\n'
+          f'Serial: {serial_time} ms\n'
+          f'Batch: {batch_time} ms')
+
+
+def point_location(qtree, count=100):
+    random = np.random.default_rng(0)
+    points = random.integers(0, [qtree.box.w, qtree.box.h], (10000, 2)).tolist()
+    pairs = safe_pairs(qtree, count)
+
+    depth = max(leaf.depth for leaf in qtree.elements())
+
+    print(f'\nPoint location (QTree, depth {depth}, {count} queries)')
+
+    for indexed in [False, True]:
+        Config.QTree.INDEXED = indexed
+        qtree.get(0, 0)
+
+        _, get_time = measure(lambda: [qtree.get(x, y) for x, y in points])
+        _, search_time = measure(lambda: [AStar(qtree, start, end).search() for start, end in pairs])
+
+        print(f'{"Indexed" if indexed else "Descent"}: '
+              f'{get_time * 1000 / len(points):.3f} us per get, '
+              f'{search_time / count:.3f} ms per query')
+
+
+def leaf_index(image, count=1000):
+    qtree = QTree(image.pixels, 0, 0, image.width(), image.height())
+    qtree.divide()
+
+    def safe_elements(invalidate):
+        for _ in range(count):
+            if invalidate:
+                qtree.elements_index = None
+
+            qtree.elements([Box.State.SAFE])
+
+    _, walk_time = measure(safe_elements, True)
+    _, indexed_time = measure(safe_elements, False)
+
+    print(f'\n'
+          f'Leaf index (QTree, {len(qtree.elements())} leaves, {count} calls)\n'
+          f'Tree walk: {walk_time} ms\n'
+          f'Cached index: {indexed_time} ms')
+
+
+def rendering(image, data, path):
+    info = AStar(data, (4990, 5035), (880, 1510)).search()
+
+    Config.Image.FAST = False
+    _, draw_time = measure(image.save, data, path, info)
+    drawn = np.asarray(PIL.Image.open(path).convert('RGB'))
+
+    Config.Image.FAST = True
+    _, paint_time = measure(image.save, data, path, info)
+    painted = np.asarray(PIL.Image.open(path).convert('RGB'))
+
+    assert np.array_equal(drawn, painted), 'Rendering mismatch'
+
+    print(f'\n'
+          f'Rendering ({type(data).__name__}, {len(data.boxes())} boxes, {info.visited_length()} visited)\n'
+          f'Draw: {draw_time} ms\n'
+          f'Paint: {paint_time} ms')
+
+
+def trajectory_smoothing(data, count=100):
+    pairs = safe_pairs(data, count)
+    infos = [AStar(data, start, end, SearchOptions(enable_smoothing=False)).search() for start, end in pairs]
+    infos = [info for info in infos if info.path is not None]
+
+    def smooth(options):
+        smoothed_infos = []
+
+        for info in infos:
+            smoothed_info = PathfinderInfo(info.pathfinder_name, info.start, info.end, options)
+            smoothed_info.set_path(data, info.path)
+            smoothed_infos.append(smoothed_info)
+
+        return smoothed_infos
+
+    Config.Path.VECTORIZED_SMOOTHING = False
+    shapely_infos, shapely_time = measure(smooth, SearchOptions(enable_smoothing=True))
+
+    Config.Path.VECTORIZED_SMOOTHING = True
+    vectorized_infos, vectorized_time = measure(smooth, SearchOptions(enable_smoothing=True))
+    sight_infos, sight_time = measure(smooth, SearchOptions(enable_smoothing=True, line_of_sight=True))
+
+    for shapely_info, vectorized_info in zip(shapely_infos, vectorized_infos):
+        assert shapely_info.points == vectorized_info.points, 'Trajectory mismatch'
+
+    print(f'\n'
+          f'Trajectory smoothing ({type(data).__name__}, {len(infos)} paths, '
+          f'{sum(info.path_length() for info in infos) / len(infos):.1f} elements per path)\n'
+          f'Shapely: {shapely_time / len(infos):.3f} ms per path, '
+          f'{np.mean([info.trajectory_length() for info in shapely_infos]):.1f} mean length\n'
+          f'Vectorized: {vectorized_time / len(infos):.3f} ms per path, '
+          f'{np.mean([info.trajectory_length() for info in vectorized_infos]):.1f} mean length\n'
+          f'Line of sight: {sight_time / len(infos):.3f} ms per path, '
+          f'{np.mean([info.trajectory_length() for info in sight_infos]):.1f} mean length')
+
+
+def any_angle(data, count=100):
+    pairs = safe_pairs(data, count)
+    options = SearchOptions(enable_smoothing=True, line_of_sight=True)
+
+    infos, astar_time = measure(lambda: [AStar(data, start, end, options).search() for start, end in pairs])
+    theta_infos, theta_time = measure(lambda: [LazyThetaStar(data, start, end, options).search() for start, end in pairs])
+
+    for info, theta_info in zip(infos, theta_infos):
+        assert (info.path is None) == (theta_info.path is None), 'Path existence mismatch'
+        assert info.path is None or theta_info.trajectory_length() <= info.trajectory_length() + 1e-6, 'Any-angle path longer'
+
+    lengths = [(info.trajectory_length(), theta_info.trajectory_length())
+               for info, theta_info in zip(infos, theta_infos) if info.path is not None]
+
+    print(f'\n'
+          f'Any-angle search ({type(data).__name__}, {count} queries)\n'
+          f'AStar + smoothing: {astar_time / count:.3f} ms per query, {np.mean([length for length, _ in lengths]):.1f} mean length\n'
+          f'LazyThetaStar: {theta_time / count:.3f} ms per query, {np.mean([length for _, length in lengths]):.1f} mean length, '
+          f'{sum(info.sight_checks for info in theta_infos) / count:.1f} sight checks')
+
+
+def occupancy_map(image, image_path, occupancy_path):
+    def create_qtree(pixels):
+        qtree = QTree(pixels, 0, 0, pixels.shape[1], pixels.shape[0])
+        qtree.divide()
+        return qtree
+
+    _, convert_time = measure(Occupancy.convert, image_path, occupancy_path)
+    occupancy, open_time = measure(Occupancy.open, occupancy_path)
+
+    print(f'\n'
+          f'Occupancy map ({occupancy.shape[1]}x{occupancy.shape[0]})\n'
+          f'Convert: {convert_time} ms\n'
+          f'Open: {open_time} ms')
+
+    for name, pixels in [('RGB array', image.pixels), ('Occupancy memmap', occupancy)]:
+        _, _, grid_peak = measure_memory(Grid, pixels)
+        _, _, qtree_peak = measure_memory(create_qtree, pixels)
+
+        print(f'{name}: Grid peak {grid_peak / 1024 / 1024:.1f} MiB, QTree peak {qtree_peak / 1024 / 1024:.1f} MiB')
+
+
+def storage_cache(image):
+    storage = Storage(tempfile.mkdtemp())
+
+    print(f'\nStorage cache')
+
+    for name, create in [('Grid', storage.grid), ('QTree', storage.qtree), ('LinearQTree', storage.linear_qtree)]:
+        _, build_time = measure(create, image.path, image.pixels)
+        data, load_time = measure(create, image.path, image.pixels)
+
+        _, graph_build_time = measure(storage.graph, image.path, data)
+        _, graph_load_time = measure(storage.graph, image.path, data)
+
+        print(f'{name}: build {build_time} ms, load {load_time} ms, '
+              f'graph build {graph_build_time} ms, graph load {graph_load_time} ms')
+
+
+def incremental_update(image, count=10, size=300):
+    def create_qtree(pixels):
+        qtree = QTree(pixels, 0, 0, pixels.shape[1], pixels.shape[0])
+        qtree.divide()
+        return qtree
+
+    def leaves(data):
+        return [(box.x, box.y, box.w, box.h, box.state) for box in data.boxes()]
+
+    def adjacency(graph):
+        return {graph.points[node]: sorted(graph.points[neighbour] for neighbour in graph.neighbours(node))
+                for node in graph.elements()}
+
+    random = np.random.default_rng(0)
+    corners = random.integers(0, [image.width() - size, image.height() - size], (count, 2)).tolist()
+
+    print(f'\nIncremental update ({count} regions of {size}x{size})')
+
+    for name, create in [('Grid', Grid), ('QTree', create_qtree)]:
+        pixels = image.pixels.copy()
+        data = create(pixels)
+        graph = Graph(data)
+
+        update_time = 0
+        patch_time = 0
+
+        for x, y in corners:
+            pixels[y:y + size, x:x + size] = Config.Color.UNSAFE
+
+            (removed, dirty), time = measure(data.update, x, y, size, size)
+            update_time += time
+
+            _, time = measure(graph.patch, removed, dirty)
+            patch_time += time
+
+        fresh_data, build_time = measure(create, pixels)
+        fresh_graph, compile_time = measure(Graph, fresh_data)
+
+        assert leaves(data) == leaves(fresh_data), 'Updated leaves mismatch'
+        assert adjacency(graph) == adjacency(fresh_graph), 'Patched graph mismatch'
+
+        print(f'{name}: update {update_time / count:.3f} ms, patch {patch_time / count:.3f} ms per region, '
+              f'rebuild {build_time} ms, compile {compile_time} ms')
+
+
+def main():
+    image = Image('images/big_map.png')
+
+    grid_creation(image)
+    qtree_creation(image)
+    qtree_layout(image)
+    leaf_index(image)
+
+    grid = Grid(image.pixels)
+    qtree = QTree(image.pixels, 0, 0, image.width(), image.height())
+    qtree.divide()
+
+    static_graph(grid)
+    static_graph(qtree)
+
+    jump_point_search(grid)
+    neighbour_generation(grid)
+    open_list(grid)
+    mixed_queries(grid)
+
+    bidirectional_search(grid)
+    bidirectional_search(qtree)
+
+    unreachable_queries(grid)
+    unreachable_queries(qtree)
+    component_update(image)
+
+    shared_goal(grid)
+    shared_goal(qtree)
+
+    repeated_queries(grid)
+    repeated_queries(qtree)
+
+    anytime_search(grid)
+    anytime_search(qtree)
+
+    hierarchical_search(image)
+    landmark_heuristic(image)
+
+    layer, proximity_time = measure(RiskMap.proximity, image.pixels, 150)
+    print(f'\nRisk proximity layer: {proximity_time} ms')
+
+    risk_search(grid, layer)
+    risk_search(qtree, layer)
+
+    point_location(qtree)
+
+    storage_cache(image)
+    incremental_update(image)
+    occupancy_map(image, 'images/big_map.png', os.path.join(tempfile.gettempdir(), 'big_map.npy'))
+
+    trajectory_smoothing(grid)
+    trajectory_smoothing(qtree)
+
+    any_angle(grid)
+    any_angle(qtree)
+
+    rendering(image, grid, os.path.join(tempfile.gettempdir(), 'grid.png'))
+    rendering(image, qtree, os.path.join(tempfile.gettempdir(), 'qtree.png'))
+
+    batch_queries(grid)
+    batch_queries(qtree)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,48 @@ class Config:
     class Path:
         ALLOW_DIAGONAL = True
         ENABLE_SMOOTHING = True
+        VECTORIZED_SMOOTHING = True
+        LINE_OF_SIGHT = False
+        HEURISTIC_WEIGHT = 1.0
+        COMPONENTS = True
 
     class QTree:
         MIN_SIZE = 100
+        INTEGRAL = True
+        INDEXED = True
 
     class Grid:
         MIN_SIZE = 100
+        VECTORIZED = True
+
+    class Hierarchy:
+        CLUSTER_SIZE = 1000
+        DEPTH = 3
+        CORRIDOR = False
+
+    class Landmarks:
+        COUNT = 8
+
+    class Risk:
+        RESOLUTION = 1
+
+    class FlowField:
+        CAPACITY = 16
+
+    class Cache:
+        CAPACITY = 256
+
+    class Anytime:
+        STEP = 0.25
+        DEADLINE = 50
+
+    class Storage:
+        PATH = 'cache'
+
+    class Occupancy:
+        SAFE = 1
+        UNSAFE = 2
+        TILE = 1024
 
     class Color:
         UNSAFE = (0, 0, 0)
@@ -20,6 +56,7 @@ class Config:
         POINT = (102, 0, 0)
 
     class Image:
+        FAST = True
         BORDER = 5
         TRAJECTORY = 10
         POINT = 15
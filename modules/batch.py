@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+
+import numpy as np
+
+from modules.data import AbstractData
+from modules.graph import Graph
+from modules.options import SearchOptions
+from modules.pathfinder import PathfinderInfo, AStar
+
+worker_state = {}
+
+
+class Batch:
+    def __init__(self, data: AbstractData, pathfinder_type=AStar, processes=None, options: SearchOptions | None = None):
+        self.data = data
+        self.pathfinder_type = pathfinder_type
+        self.options = options if options is not None else SearchOptions.of(data)
+        self.processes = processes or os.cpu_count()
+        self.nodes = Graph.nodes_of(data)
+        self.pool = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        if self.pool is not None:
+            return
+
+        context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+        self.pool = context.Pool(self.processes, initializer=Batch.initialize, initargs=(self.data, self.pathfinder_type, self.options))
+
+    def close(self):
+        if self.pool is None:
+            return
+
+        self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+    def search(self, pairs, compact=False):
+        opened = self.pool is None
+        self.open()
+
+        chunk_size = max(1, len(pairs) // (self.processes * 4))
+        results = self.pool.map(Batch.run, pairs, chunksize=chunk_size)
+
+        if opened:
+            self.close()
+
+        if compact:
+            return [(np.array(path, dtype=np.int32), np.array(points or [], dtype=np.int32).reshape(-1, 2), expanded)
+                    for _, path, points, expanded in results]
+
+        return [self.__build_info(pair, result) for pair, result in zip(pairs, results)]
+
+    def __build_info(self, pair, result):
+        visited, path, points, expanded = result
+        info = PathfinderInfo(self.pathfinder_type.__name__, *pair, self.options)
+
+        info.set_visited(self.data, [self.nodes[element] for element in visited])
+        info.set_path(self.data, [self.nodes[element] for element in path] if path else None, points)
+        info.expanded = expanded
+
+        return info
+
+    @staticmethod
+    def initialize(data: AbstractData, pathfinder_type, options: SearchOptions):
+        nodes = Graph.nodes_of(data)
+
+        worker_state['data'] = data
+        worker_state['pathfinder_type'] = pathfinder_type
+        worker_state['options'] = options
+        worker_state['ids'] = {node: index for index, node in enumerate(nodes)}
+
+    @staticmethod
+    def run(pair):
+        start, end = pair
+        ids = worker_state['ids']
+
+        info = worker_state['pathfinder_type'](worker_state['data'], start, end, worker_state['options']).search()
+
+        visited = [ids[element] for element in info.visited or []]
+        path = [ids[element] for element in info.path or []]
+
+        return visited, path, info.points, info.expanded
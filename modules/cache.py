@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+from config import Config
+from modules.data import AbstractData
+from modules.options import SearchOptions
+from modules.pathfinder import AStar, PathfinderInfo
+
+
+class QueryCache:
+    def __init__(self, data: AbstractData, pathfinder_type=AStar, capacity=Config.Cache.CAPACITY):
+        assert capacity > 0, 'Invalid capacity'
+
+        self.data = data
+        self.pathfinder_type = pathfinder_type
+        self.capacity = capacity
+        self.version = data.version
+        self.entries: OrderedDict[tuple, PathfinderInfo] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, start, end, options: SearchOptions | None = None) -> PathfinderInfo:
+        options = options if options is not None else SearchOptions.of(self.data)
+
+        if self.version != self.data.version:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.version = self.data.version
+
+        key = self.data.get(*start), self.data.get(*end), options.key()
+        entry = self.entries.get(key)
+
+        if entry is not None and self.__reusable(entry, start, end):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry.moved(self.data, start, end)
+
+        self.misses += 1
+        info = self.pathfinder_type(self.data, start, end, options).search()
+        self.entries[key] = info
+        self.entries.move_to_end(key)
+
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+        return info
+
+    @staticmethod
+    def __reusable(entry: PathfinderInfo, start, end):
+        return entry.path is None or entry.inner_points is not None or (entry.start, entry.end) == (start, end)
@@ -0,0 +1,164 @@
+import weakref
+
+import numpy as np
+
+from modules.data import AbstractData, Box, Grid, LinearQTree
+from modules.graph import Graph
+from modules.options import SearchOptions
+
+
+class Components:
+    shared_components = weakref.WeakKeyDictionary()
+
+    def __init__(self, data: AbstractData, options: SearchOptions):
+        self.data = data
+        self.options = options
+        self.version = data.version
+        self.ids = None
+        self.safe = None
+        self.values = None
+
+        if isinstance(data, Grid):
+            safe = data.walkable_mask()
+            sources, targets, _ = data.frontier(np.arange(len(safe)), options)
+        elif isinstance(data, Graph):
+            safe = data.states == Box.State.SAFE.index
+            sources = np.repeat(np.arange(len(data)), np.diff(data.indptr))
+            targets = data.indices.astype(np.int64)
+        else:
+            nodes = Graph.nodes_of(data)
+            self.ids = None if isinstance(data, LinearQTree) else {node: index for index, node in enumerate(nodes)}
+            safe = np.array([box.state == Box.State.SAFE for box in data.boxes(nodes)], dtype=bool)
+            sources, targets = self.__edges(nodes, options)
+
+        kept = safe[sources] & safe[targets]
+        labels = Components.label(len(safe), sources[kept], targets[kept])
+        labels[~safe] = -1
+
+        if isinstance(data, Grid):
+            self.safe = safe.copy()
+            self.values = labels
+
+        self.labels = labels.tolist()
+        self.count = len(np.unique(labels[safe]))
+
+    @staticmethod
+    def shared(data: AbstractData, options: SearchOptions):
+        components = Components.shared_components.setdefault(data, {})
+        current = components.get(options.allow_diagonal)
+
+        if current is None or current.version != data.version and not current.__refresh():
+            current = Components(data, options)
+            components[options.allow_diagonal] = current
+
+        return current
+
+    def connected(self, start, end):
+        if start is None or end is None:
+            return False
+
+        if start == end:
+            return True
+
+        label = self.labels[self.__index(end)]
+        start_label = self.labels[self.__index(start)]
+
+        if label < 0 or start_label >= 0:
+            return label >= 0 and start_label == label
+
+        return any(self.labels[self.__index(neighbour)] == label for neighbour in self.data.neighbours(start, self.options))
+
+    @staticmethod
+    def label(count, sources: np.ndarray, targets: np.ndarray):
+        parents = np.arange(count)
+
+        while True:
+            source_roots, target_roots = parents[sources], parents[targets]
+            different = source_roots != target_roots
+
+            if not different.any():
+                return parents
+
+            np.minimum.at(parents, np.maximum(source_roots, target_roots)[different], np.minimum(source_roots, target_roots)[different])
+
+            while True:
+                grandparents = parents[parents]
+
+                if np.array_equal(grandparents, parents):
+                    break
+
+                parents = grandparents
+
+    def __refresh(self):
+        if self.safe is None:
+            return False
+
+        safe = self.data.walkable_mask()
+        changed = np.flatnonzero(safe != self.safe)
+        self.version = self.data.version
+
+        if len(changed) == 0:
+            return True
+
+        labels = self.values
+        removed = changed[~safe[changed]]
+        affected = np.unique(labels[removed])
+        labels[removed] = -1
+
+        region = np.union1d(np.flatnonzero(np.isin(labels, affected)), changed[safe[changed]])
+
+        if 2 * len(region) > len(safe):
+            return False
+
+        touched = [removed, region]
+        groups = 0
+
+        if len(region):
+            sources, targets, _ = self.data.frontier(region, self.options)
+            kept = safe[targets]
+            sources, targets = sources[kept], targets[kept]
+
+            inner = np.isin(targets, region)
+            outer, inverse = np.unique(labels[targets[~inner]], return_inverse=True)
+            local_targets = np.empty(len(targets), dtype=np.int64)
+            local_targets[inner] = np.searchsorted(region, targets[inner])
+            local_targets[~inner] = len(region) + inverse
+
+            roots = Components.label(len(region) + len(outer), np.searchsorted(region, sources), local_targets)
+            nodes = np.concatenate([region, outer])
+            limit = np.iinfo(np.int64).max
+            best = np.full(len(nodes), limit)
+            np.minimum.at(best, roots[len(region):], outer)
+            chosen = np.where(best[roots] < limit, best[roots], nodes[roots])
+
+            labels[region] = chosen[:len(region)]
+            merged = outer != chosen[len(region):]
+
+            if merged.any():
+                cells = np.flatnonzero(np.isin(labels, outer[merged]))
+                labels[cells] = chosen[len(region) + np.searchsorted(outer, labels[cells])]
+                touched.append(cells)
+
+            groups = len(np.unique(roots)) - len(outer)
+
+        for cell, label in zip(np.concatenate(touched).tolist(), labels[np.concatenate(touched)].tolist()):
+            self.labels[cell] = label
+
+        self.safe = safe.copy()
+        self.count += groups - len(affected)
+
+        return True
+
+    def __index(self, element):
+        return element if self.ids is None else self.ids[element]
+
+    def __edges(self, nodes, options: SearchOptions):
+        sources = []
+        targets = []
+
+        for index, node in enumerate(nodes):
+            for neighbour in self.data.neighbours(node, options):
+                sources.append(index)
+                targets.append(self.__index(neighbour))
+
+        return np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
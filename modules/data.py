@@ -1,3 +1,4 @@
+import tempfile
 from abc import ABC, abstractmethod
 from collections import deque
 from enum import Enum, IntEnum
@@ -32,14 +33,25 @@ class Box:
     def contains(self, x, y):
         return self.x <= x < self.x + self.w and self.y <= y < self.y + self.h
 
+    def intersects(self, box: 'Box'):
+        return self.x < box.x + box.w and box.x < self.x + self.w and self.y < box.y + box.h and box.y < self.y + self.h
+
     def center(self):
         return self.x + self.w // 2, self.y + self.h // 2
 
     @staticmethod
     def slice_state(data_slice: np.ndarray):
-        any_safe = np.any(data_slice == Config.Color.SAFE)
-        any_unsafe = np.any(data_slice == Config.Color.UNSAFE)
+        return Box.flags_state(*Box.slice_flags(data_slice))
+
+    @staticmethod
+    def slice_flags(data_slice: np.ndarray):
+        if data_slice.ndim == 2:
+            return bool(np.any(data_slice & Config.Occupancy.SAFE)), bool(np.any(data_slice & Config.Occupancy.UNSAFE))
 
+        return bool(np.any(data_slice == Config.Color.SAFE)), bool(np.any(data_slice == Config.Color.UNSAFE))
+
+    @staticmethod
+    def flags_state(any_safe, any_unsafe):
         if any_safe and not any_unsafe:
             return Box.State.SAFE
         elif not any_safe and any_unsafe:
@@ -47,6 +59,149 @@ class Box:
 
         return Box.State.MIXED
 
+    @staticmethod
+    def blocks_state(pixels: np.ndarray, size):
+        rows = pixels.shape[0] // size
+        columns = pixels.shape[1] // size
+
+        any_safe = Box.__blocks_any(pixels, Config.Color.SAFE, rows, columns, size)
+        any_unsafe = Box.__blocks_any(pixels, Config.Color.UNSAFE, rows, columns, size)
+
+        states = np.full((rows, columns), Box.State.MIXED.index, dtype=np.uint8)
+        states[any_safe & ~any_unsafe] = Box.State.SAFE.index
+        states[~any_safe & any_unsafe] = Box.State.UNSAFE.index
+
+        return states
+
+    @staticmethod
+    def occupancy(pixels: np.ndarray):
+        occupancy = Box.color_mask(pixels, Config.Color.SAFE) * np.uint8(Config.Occupancy.SAFE)
+        occupancy |= Box.color_mask(pixels, Config.Color.UNSAFE) * np.uint8(Config.Occupancy.UNSAFE)
+
+        return occupancy
+
+    @staticmethod
+    def color_mask(pixels: np.ndarray, color):
+        if pixels.ndim == 2:
+            return Box.__channels_mask(pixels, color)
+
+        channels = pixels.shape[2]
+        mask = Box.__channels_mask(pixels, color)
+        pixels_mask = mask[:, 0::channels]
+
+        for channel in range(1, channels):
+            pixels_mask = pixels_mask | mask[:, channel::channels]
+
+        return pixels_mask
+
+    @staticmethod
+    def __blocks_any(pixels: np.ndarray, color, rows, columns, size):
+        mask = Box.__channels_mask(pixels, color)
+        return mask.reshape(rows, size, columns, -1).any(axis=3).any(axis=1)
+
+    @staticmethod
+    def __channels_mask(pixels: np.ndarray, color):
+        if pixels.ndim == 2:
+            flag = Config.Occupancy.SAFE if color == Config.Color.SAFE else Config.Occupancy.UNSAFE
+            return (pixels & flag) != 0
+
+        height, width = pixels.shape[0], pixels.shape[1]
+        row_color = np.tile(np.asarray(color, dtype=pixels.dtype), width)
+
+        return pixels.reshape(height, -1) == row_color
+
+
+class Integral:
+    def __init__(self, pixels: np.ndarray, x=0, y=0):
+        self.x = x
+        self.y = y
+        self.safe = Integral.__table(pixels)
+        self.unsafe = Integral.__table(pixels)
+
+        for top in range(0, pixels.shape[0], Config.Occupancy.TILE):
+            tile = pixels[top:top + Config.Occupancy.TILE]
+
+            Integral.__accumulate(self.safe, Box.color_mask(tile, Config.Color.SAFE), top)
+            Integral.__accumulate(self.unsafe, Box.color_mask(tile, Config.Color.UNSAFE), top)
+
+    def state(self, x, y, w, h):
+        x, y = x - self.x, y - self.y
+
+        any_safe = Integral.__count(self.safe, x, y, w, h) > 0
+        any_unsafe = Integral.__count(self.unsafe, x, y, w, h) > 0
+
+        return Box.flags_state(any_safe, any_unsafe)
+
+    @staticmethod
+    def __count(table: np.ndarray, x, y, w, h):
+        return int(table[y + h, x + w]) - int(table[y, x + w]) - int(table[y + h, x]) + int(table[y, x])
+
+    @staticmethod
+    def __table(pixels: np.ndarray):
+        shape = pixels.shape[0] + 1, pixels.shape[1] + 1
+
+        if isinstance(pixels, np.memmap):
+            return np.memmap(tempfile.TemporaryFile(), dtype=np.uint32, mode='w+', shape=shape)
+
+        return np.zeros(shape, dtype=np.uint32)
+
+    @staticmethod
+    def __accumulate(table: np.ndarray, mask: np.ndarray, top):
+        rows = np.cumsum(mask, axis=1, dtype=np.uint32)
+
+        for row in range(mask.shape[0]):
+            np.add(table[top + row, 1:], rows[row], out=table[top + row + 1, 1:])
+
+
+class Lattice:
+    def __init__(self, x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray):
+        self.xs = np.unique(np.concatenate([x, x + w]))
+        self.ys = np.unique(np.concatenate([y, y + h]))
+
+        self.first_columns, self.last_columns = np.searchsorted(self.xs, x), np.searchsorted(self.xs, x + w)
+        self.first_rows, self.last_rows = np.searchsorted(self.ys, y), np.searchsorted(self.ys, y + h)
+
+    def __len__(self):
+        return len(self.first_columns)
+
+    @staticmethod
+    def from_boxes(boxes: list[Box]):
+        x = np.array([box.x for box in boxes], dtype=np.int64)
+        y = np.array([box.y for box in boxes], dtype=np.int64)
+        w = np.array([box.w for box in boxes], dtype=np.int64)
+        h = np.array([box.h for box in boxes], dtype=np.int64)
+
+        return Lattice(x, y, w, h)
+
+    def raster(self, values: np.ndarray, fill, indexes=None):
+        raster = np.full((len(self.ys) - 1, len(self.xs) - 1), fill, dtype=values.dtype)
+
+        for index in range(len(self)) if indexes is None else indexes:
+            raster[self.first_rows[index]:self.last_rows[index], self.first_columns[index]:self.last_columns[index]] = values[index]
+
+        return raster
+
+
+class Locator:
+    def __init__(self, lattice: Lattice):
+        xs, ys = lattice.xs, lattice.ys
+
+        self.x = int(xs[0])
+        self.y = int(ys[0])
+        self.columns = np.repeat(np.arange(len(xs) - 1), np.diff(xs)).tolist()
+        self.rows = np.repeat(np.arange(len(ys) - 1), np.diff(ys)).tolist()
+        self.raster = lattice.raster(np.arange(len(lattice), dtype=np.int32), -1).tolist()
+
+    def get(self, x, y):
+        column = x - self.x
+        row = y - self.y
+
+        if not (0 <= column < len(self.columns) and 0 <= row < len(self.rows)):
+            return None
+
+        index = self.raster[self.rows[row]][self.columns[column]]
+        return index if index >= 0 else None
+
 
 class AbstractData(ABC):
 
@@ -73,9 +228,12 @@ class AbstractData(ABC):
     def __init__(self, pixels: np.ndarray):
         self.pixels = pixels
         self.distance_method = AbstractData.DistanceMethod.EUCLIDIAN
+        self.version = 0
+        self.landmarks = None
+        self.risk = None
 
-    def distance(self, p0, p1):
-        match self.distance_method:
+    def distance(self, p0, p1, options=None):
+        match self.distance_method if options is None else options.distance_method:
             case AbstractData.DistanceMethod.EUCLIDIAN:
                 return Distance.euclidian(p0, p1)
             case AbstractData.DistanceMethod.MANHATTAN:
@@ -85,6 +243,19 @@ class AbstractData(ABC):
     def check(box: Box):
         return box.state == Box.State.SAFE
 
+    @staticmethod
+    def diagonal(options=None):
+        return Config.Path.ALLOW_DIAGONAL if options is None else options.allow_diagonal
+
+    def landmark_bound(self, start, end, options=None):
+        if self.landmarks is None or not self.landmarks.valid(self, options):
+            return 0
+
+        if self is not self.landmarks.graph:
+            start, end = self.landmarks.graph.ids[start], self.landmarks.graph.ids[end]
+
+        return self.landmarks.heuristic(start, end)
+
     @classmethod
     @abstractmethod
     def get(cls, x: int, y: int):
@@ -102,36 +273,56 @@ class AbstractData(ABC):
 
     @classmethod
     @abstractmethod
-    def neighbour(cls, element, direction: Direction):
+    def neighbour(cls, element, direction: Direction, options=None):
         ...
 
     @classmethod
     @abstractmethod
-    def neighbours(cls, element):
+    def neighbours(cls, element, options=None):
         ...
 
     @classmethod
     @abstractmethod
-    def cost(cls, start, end):
+    def cost(cls, start, end, options=None):
         ...
 
     @classmethod
     @abstractmethod
-    def heuristic(cls, start, end):
+    def heuristic(cls, start, end, options=None):
         ...
 
 
 class Grid(AbstractData):
-    def __init__(self, pixels: np.ndarray):
+    OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1), (-1, -1), (-1, 1), (1, 1), (1, -1)]
+
+    def __init__(self, pixels: np.ndarray, states: np.ndarray | None = None):
         super().__init__(pixels)
         self.rows = pixels.shape[0] // Config.Grid.MIN_SIZE
         self.columns = pixels.shape[1] // Config.Grid.MIN_SIZE
+        self.states = np.zeros((self.rows, self.columns), dtype=np.uint8)
         self.boxes_list: list[Box] = []
+        self.elements_index: dict[frozenset, list[Box]] = {}
+        self.walkable: np.ndarray | None = None
+        self.walkable_list: list[bool] | None = None
+        self.neighbour_tables: dict[bool, np.ndarray] = {}
+        self.neighbour_lists: dict[bool, list[list[int]]] = {}
+        self.step_costs: dict[AbstractData.DistanceMethod, np.ndarray] = {}
+
+        if states is not None:
+            assert states.shape == self.states.shape, 'Invalid states'
+            self.states = states.astype(np.uint8)
+        else:
+            self.__init_states()
+
         self.__init_boxes()
 
     def get(self, x, y):
         row = y // Config.Grid.MIN_SIZE
         column = x // Config.Grid.MIN_SIZE
+
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            return None
+
         return self.index(row, column)
 
     def index(self, row, column):
@@ -141,12 +332,18 @@ class Grid(AbstractData):
         if states is None:
             return self.boxes_list
 
+        key = frozenset(states)
+
+        if key in self.elements_index:
+            return self.elements_index[key]
+
         elements = []
 
         for box in self.boxes_list:
             if box.state in states:
                 elements.append(box)
 
+        self.elements_index[key] = elements
         return elements
 
     def boxes(self, target_list=None):
@@ -160,6 +357,37 @@ class Grid(AbstractData):
 
         return boxes
 
+    def update(self, x, y, w, h):
+        size = Config.Grid.MIN_SIZE
+
+        first_row, last_row = max(y // size, 0), min((y + h - 1) // size, self.rows - 1)
+        first_column, last_column = max(x // size, 0), min((x + w - 1) // size, self.columns - 1)
+
+        tile = self.pixels[first_row * size:(last_row + 1) * size, first_column * size:(last_column + 1) * size]
+        tile_states = Box.blocks_state(tile, size)
+        states = self.states[first_row:last_row + 1, first_column:last_column + 1]
+
+        box_states = list(Box.State)
+        changed = []
+
+        for row, column in zip(*np.nonzero(tile_states != states)):
+            state = tile_states[row, column]
+            row, column = int(row) + first_row, int(column) + first_column
+
+            self.states[row, column] = state
+            self.boxes_list[self.index(row, column)].state = box_states[state]
+            changed.append(self.index(row, column))
+
+        dirty = self.__dirty(changed)
+
+        if changed:
+            self.elements_index = {}
+            self.__patch(changed, dirty)
+
+        self.version += 1
+
+        return [], dirty
+
     def direction(self, start: int, end: int):
         x0, y0 = self.boxes_list[start].center()
         x1, y1 = self.boxes_list[end].center()
@@ -181,84 +409,170 @@ class Grid(AbstractData):
         elif x0 > x1 and y0 > y1:
             return AbstractData.Direction.NW
 
-    def neighbour(self, element: int, direction: AbstractData.Direction):
-        row = element // self.columns
-        column = element - row * self.columns
+    def neighbour(self, element: int, direction: AbstractData.Direction, options=None):
+        neighbour = int(self.__neighbour_table(options)[element, direction])
+        return neighbour if neighbour >= 0 else None
 
-        if Config.Path.ALLOW_DIAGONAL and direction.is_diagonal():
-            return self.__diagonal_neighbour(row, column, direction)
+    def neighbours(self, element: int, options=None):
+        neighbours = self.__neighbour_table(options)[element]
+        return neighbours[neighbours >= 0].tolist()
 
-        return self.__cardinal_neighbour(row, column, direction)
+    def edges(self, element: int, options=None):
+        neighbours = self.__neighbour_table(options)[element]
+        valid = neighbours >= 0
+        neighbours, costs = neighbours[valid], self.__step_costs(options)[valid]
 
-    def neighbours(self, element: int):
-        neighbours = []
+        if self.risk is not None:
+            costs = costs * (self.risk.multipliers_of(neighbours) + self.risk.multiplier(element)) / 2
+
+        return zip(neighbours.tolist(), costs.tolist())
+
+    def neighbour_list(self, options=None):
+        diagonal = AbstractData.diagonal(options)
+        neighbour_list = self.neighbour_lists.get(diagonal)
+
+        if neighbour_list is None:
+            neighbour_list = self.__neighbour_table(options).tolist()
+            self.neighbour_lists[diagonal] = neighbour_list
+
+        return neighbour_list
+
+    def step_cost_list(self, options=None):
+        return self.__step_costs(options).tolist()
+
+    def frontier(self, elements: np.ndarray, options=None):
+        neighbours = self.__neighbour_table(options)[elements]
+        sources, directions = np.nonzero(neighbours >= 0)
+        sources, targets, costs = elements[sources], neighbours[sources, directions], self.__step_costs(options)[directions]
+
+        if self.risk is not None:
+            costs = costs * (self.risk.multipliers_of(sources) + self.risk.multipliers_of(targets)) / 2
+
+        return sources, targets, costs
+
+    def walkable_mask(self):
+        if self.walkable is None:
+            self.walkable = (self.states == Box.State.SAFE.index).ravel()
+
+        return self.walkable
+
+    def walkable_cells(self):
+        if self.walkable_list is None:
+            self.walkable_list = self.walkable_mask().tolist()
+
+        return self.walkable_list
+
+    def cost(self, start: int, end: int, options=None):
+        cost = self.distance(self.boxes_list[start].center(), self.boxes_list[end].center(), options)
+        return cost if self.risk is None else cost * self.risk.factor(start, end)
+
+    def heuristic(self, start: int, end: int, options=None):
+        distance = self.distance(self.boxes_list[start].center(), self.boxes_list[end].center(), options)
+        return max(distance, self.landmark_bound(start, end, options))
+
+    def __neighbour_table(self, options=None):
+        diagonal = AbstractData.diagonal(options)
+        neighbour_table = self.neighbour_tables.get(diagonal)
+
+        if neighbour_table is None:
+            neighbour_table = self.__neighbour_rows(np.arange(self.rows * self.columns), diagonal)
+            self.neighbour_tables[diagonal] = neighbour_table
+
+        return neighbour_table
+
+    def __step_costs(self, options=None):
+        distance_method = self.distance_method if options is None else options.distance_method
+        step_costs = self.step_costs.get(distance_method)
+
+        if step_costs is None:
+            size = self.pixels.shape[1] // self.columns
+            step_costs = np.array([self.distance((0, 0), (d_column * size, d_row * size), options) for d_row, d_column in Grid.OFFSETS])
+            self.step_costs[distance_method] = step_costs
+
+        return step_costs
+
+    def __neighbour_rows(self, elements: np.ndarray, diagonal):
+        walkable = self.walkable_mask()
+        rows, columns = np.divmod(elements, self.columns)
+        neighbour_table = np.full((len(elements), len(AbstractData.Direction)), -1, dtype=np.int64)
 
         for direction in AbstractData.Direction:
-            neighbour = self.neighbour(element, direction)
+            if direction.is_diagonal() and not diagonal:
+                continue
 
-            if neighbour is not None:
-                neighbours.append(neighbour)
+            d_row, d_column = Grid.OFFSETS[direction]
+            neighbour_rows, neighbour_columns = rows + d_row, columns + d_column
 
-        return neighbours
+            valid = (neighbour_rows >= 0) & (neighbour_rows < self.rows) & (neighbour_columns >= 0) & (neighbour_columns < self.columns)
+            neighbours = np.where(valid, neighbour_rows * self.columns + neighbour_columns, 0)
+            valid &= walkable[neighbours]
 
-    def cost(self, start: int, end: int):
-        return self.distance(self.boxes_list[start].center(), self.boxes_list[end].center())
+            neighbour_table[valid, direction] = neighbours[valid]
 
-    def heuristic(self, start: int, end: int):
-        return self.cost(start, end)
+        return neighbour_table
 
-    def __cardinal_neighbour(self, row, column, direction: AbstractData.Direction):
-        match direction:
-            case AbstractData.Direction.N:
-                index = self.index(row - 1, column)
-                if row > 0 and AbstractData.check(self.boxes_list[index]):
-                    return index
-            case AbstractData.Direction.E:
-                index = self.index(row, column + 1)
-                if column < self.columns - 1 and AbstractData.check(self.boxes_list[index]):
-                    return index
-            case AbstractData.Direction.S:
-                index = self.index(row + 1, column)
-                if row < self.rows - 1 and AbstractData.check(self.boxes_list[index]):
-                    return index
-            case AbstractData.Direction.W:
-                index = self.index(row, column - 1)
-                if column > 0 and AbstractData.check(self.boxes_list[index]):
-                    return index
+    def __patch(self, changed, dirty):
+        if self.walkable is not None:
+            self.walkable[changed] = self.states.ravel()[changed] == Box.State.SAFE.index
 
-    def __diagonal_neighbour(self, row, column, direction: AbstractData.Direction):
-        match direction:
-            case AbstractData.Direction.NW:
-                index = self.index(row - 1, column - 1)
-                if row > 0 and column > 0 and AbstractData.check(self.boxes_list[index]):
-                    return index
-            case AbstractData.Direction.NE:
-                index = self.index(row - 1, column + 1)
-                if row > 0 and column < self.columns - 1 and AbstractData.check(self.boxes_list[index]):
-                    return index
-            case AbstractData.Direction.SE:
-                index = self.index(row + 1, column + 1)
-                if row < self.rows - 1 and column < self.columns - 1 and AbstractData.check(self.boxes_list[index]):
-                    return index
-            case AbstractData.Direction.SW:
-                index = self.index(row + 1, column - 1)
-                if row < self.rows - 1 and column > 0 and AbstractData.check(self.boxes_list[index]):
-                    return index
+        if self.walkable_list is not None:
+            for element in changed:
+                self.walkable_list[element] = bool(self.walkable[element])
 
-    def __init_boxes(self):
+        for diagonal, neighbour_table in self.neighbour_tables.items():
+            rows = self.__neighbour_rows(np.array(dirty, dtype=np.int64), diagonal)
+            neighbour_table[dirty] = rows
+
+            if diagonal in self.neighbour_lists:
+                neighbour_list = self.neighbour_lists[diagonal]
+
+                for element, row in zip(dirty, rows.tolist()):
+                    neighbour_list[element] = row
+
+    def __dirty(self, changed):
+        dirty = set()
+
+        for element in changed:
+            row, column = divmod(element, self.columns)
+
+            for neighbour_row in range(max(row - 1, 0), min(row + 2, self.rows)):
+                for neighbour_column in range(max(column - 1, 0), min(column + 2, self.columns)):
+                    dirty.add(self.index(neighbour_row, neighbour_column))
+
+        return sorted(dirty)
+
+    def __init_states(self):
         size = Config.Grid.MIN_SIZE
 
         assert self.pixels.shape[0] % size == 0 and self.pixels.shape[1] % size == 0, 'Invalid size'
 
+        if Config.Grid.VECTORIZED:
+            tile_rows = max(1, Config.Occupancy.TILE // size)
+
+            for row in range(0, self.rows, tile_rows):
+                tile = self.pixels[row * size:(row + tile_rows) * size]
+                self.states[row:row + tile_rows] = Box.blocks_state(tile, size)
+
+            return
+
         for row in range(self.rows):
             for column in range(self.columns):
                 x = column * size
                 y = row * size
 
                 pixels_slice = self.pixels[y:y+size, x:x+size]
-                state = Box.slice_state(pixels_slice)
+                self.states[row, column] = Box.slice_state(pixels_slice).index
+
+    def __init_boxes(self):
+        size = Config.Grid.MIN_SIZE
+        states = list(Box.State)
+
+        for row in range(self.rows):
+            for column in range(self.columns):
+                x = column * size
+                y = row * size
 
-                box = Box(x, y, size, size, state)
+                box = Box(x, y, size, size, states[self.states[row, column]])
                 self.boxes_list.append(box)
 
 
@@ -275,6 +589,10 @@ class QTree(AbstractData):
         self.depth = 0
         self.parent: QTree = None
         self.children: list[QTree] = []
+        self.elements_index: dict[frozenset | None, list[QTree]] | None = None
+        self.boxes_list: list[Box] | None = None
+        self.locator: Locator | None = None
+        self.locator_leaves: list[QTree] = []
 
     def __repr__(self):
         return f'QTree(box={self.box}, depth={self.depth})'
@@ -286,8 +604,12 @@ class QTree(AbstractData):
         node.depth = self.depth + 1
         node.parent = self
         self.children.append(node)
+        self.__invalidate()
 
     def get(self, x, y):
+        if Config.QTree.INDEXED and self.parent is None:
+            return self.__indexed_get(x, y)
+
         if self.is_leaf():
             return self
 
@@ -296,20 +618,23 @@ class QTree(AbstractData):
                 return node.get(x, y)
 
     def elements(self, states=None):
-        candidates = self.__search_children()
+        if self.parent is not None:
+            return QTree.__filter(self.__search_children(), states)
 
-        if states is None:
-            return candidates
+        if self.elements_index is None:
+            self.__init_index()
 
-        elements = []
+        key = frozenset(states) if states is not None else None
 
-        for node in candidates:
-            if node.box.state in states:
-                elements.append(node)
+        if key not in self.elements_index:
+            self.elements_index[key] = QTree.__filter(self.elements_index[None], states)
 
-        return elements
+        return self.elements_index[key]
 
     def boxes(self, targets=None):
+        if targets is None and self.parent is None and self.boxes_list is not None:
+            return self.boxes_list
+
         boxes = []
 
         if targets is None:
@@ -318,6 +643,9 @@ class QTree(AbstractData):
             for element in elements:
                 boxes.append(element.box)
 
+            if self.parent is None:
+                self.boxes_list = boxes
+
             return boxes
 
         for target in targets:
@@ -326,10 +654,59 @@ class QTree(AbstractData):
         return boxes
 
     def divide(self):
+        integral = Integral(self.pixels) if Config.QTree.INTEGRAL else None
+        self.__divide(integral)
+        self.__invalidate()
+
+        if self.parent is None:
+            self.__init_index()
+
+    def update(self, x, y, w, h):
+        assert self.parent is None, 'Update must start at the root'
+
+        removed: list[QTree] = []
+        added: dict[QTree, None] = {}
+
+        self.__update(Box(x, y, w, h), removed, added)
+        self.__invalidate()
+        self.version += 1
+
+        return removed, self.__dirty(list(added))
+
+    def neighbour(self, element: 'QTree', direction: AbstractData.Direction, options=None):
+        if AbstractData.diagonal(options) and direction.is_diagonal():
+            diagonal_neighbour = self.__diagonal_neighbour(element, direction)
+            return [diagonal_neighbour] if diagonal_neighbour is not None else []
+
+        return self.__cardinal_neighbours(element, direction)
+
+    def neighbours(self, element: 'QTree', options=None):
+        neighbours = set()
+
+        for direction in AbstractData.Direction:
+            direction_neighbours = self.neighbour(element, direction, options)
+
+            for neighbour in direction_neighbours:
+                neighbours.add(neighbour)
+
+        return neighbours
+
+    def cost(self, start: 'QTree', end: 'QTree', options=None):
+        cost = self.distance(start.box.center(), end.box.center(), options)
+        return cost if self.risk is None else cost * self.risk.factor(start, end)
+
+    def heuristic(self, start: 'QTree', end: 'QTree', options=None):
+        distance = self.distance(start.box.center(), end.box.center(), options)
+        return max(distance, self.landmark_bound(start, end, options))
+
+    def __divide(self, integral: Integral | None):
         x, y, w, h = self.box.x, self.box.y, self.box.w, self.box.h
 
-        pixels_slice = self.pixels[y:y + h, x:x + w]
-        self.box.state = Box.slice_state(pixels_slice)
+        if integral is not None:
+            self.box.state = integral.state(x, y, w, h)
+        else:
+            pixels_slice = self.pixels[y:y + h, x:x + w]
+            self.box.state = Box.slice_state(pixels_slice)
 
         if self.box.state != Box.State.MIXED:
             return
@@ -353,31 +730,142 @@ class QTree(AbstractData):
         self.add_child(se_child)
 
         for child in self.children:
-            child.divide()
+            child.__divide(integral)
 
-    def neighbour(self, element: 'QTree', direction: AbstractData.Direction):
-        if Config.Path.ALLOW_DIAGONAL and direction.is_diagonal():
-            diagonal_neighbour = self.__diagonal_neighbour(element, direction)
-            return [diagonal_neighbour] if diagonal_neighbour is not None else []
+    def __update(self, region: Box, removed: list['QTree'], added: dict['QTree', None]):
+        if not self.box.intersects(region):
+            return
 
-        return self.__cardinal_neighbours(element, direction)
+        if self.is_leaf():
+            x, y, w, h = self.box.x, self.box.y, self.box.w, self.box.h
+            integral = Integral(self.pixels[y:y + h, x:x + w], x, y) if Config.QTree.INTEGRAL else None
 
-    def neighbours(self, element: 'QTree'):
-        neighbours = set()
+            removed.append(self)
+            self.__divide(integral)
+            added.update(dict.fromkeys(self.__search_children()))
+            return
 
-        for direction in AbstractData.Direction:
-            direction_neighbours = self.neighbour(element, direction)
+        for child in self.children:
+            child.__update(region, removed, added)
 
-            for neighbour in direction_neighbours:
-                neighbours.add(neighbour)
+        state = Box.flags_state(*self.__flags())
 
-        return neighbours
+        if state == Box.State.MIXED:
+            return
+
+        for leaf in self.__search_children():
+            if leaf in added:
+                del added[leaf]
+            else:
+                removed.append(leaf)
+
+        self.children = []
+        self.box.state = state
+        added[self] = None
+
+    def __flags(self):
+        if not self.is_leaf():
+            any_safe, any_unsafe = False, False
+
+            for child in self.children:
+                child_safe, child_unsafe = child.__flags()
+                any_safe, any_unsafe = any_safe or child_safe, any_unsafe or child_unsafe
+
+                if any_safe and any_unsafe:
+                    break
+
+            return any_safe, any_unsafe
+
+        match self.box.state:
+            case Box.State.SAFE:
+                return True, False
+            case Box.State.UNSAFE:
+                return False, True
+
+        return Box.slice_flags(self.pixels[self.box.y:self.box.y + self.box.h, self.box.x:self.box.x + self.box.w])
 
-    def cost(self, start: 'QTree', end: 'QTree'):
-        return self.distance(start.box.center(), end.box.center())
+    def __dirty(self, added: list['QTree']):
+        dirty = list(added)
+        known = set(added)
 
-    def heuristic(self, start: 'QTree', end: 'QTree'):
-        return self.cost(start, end)
+        for element in added:
+            for neighbour in self.__adjacent(element):
+                if neighbour not in known:
+                    known.add(neighbour)
+                    dirty.append(neighbour)
+
+        return dirty
+
+    def __adjacent(self, element: 'QTree'):
+        box = element.box
+        adjacent = []
+
+        for x, y in [(box.x - 1, box.y - 1), (box.x + box.w, box.y - 1), (box.x + box.w, box.y + box.h), (box.x - 1, box.y + box.h)]:
+            adjacent.append(self.__descend(x, y))
+
+        for top in [box.y - 1, box.y + box.h]:
+            x = box.x
+
+            while x < box.x + box.w:
+                neighbour = self.__descend(x, top)
+                adjacent.append(neighbour)
+                x = neighbour.box.x + neighbour.box.w if neighbour is not None else box.x + box.w
+
+        for left in [box.x - 1, box.x + box.w]:
+            y = box.y
+
+            while y < box.y + box.h:
+                neighbour = self.__descend(left, y)
+                adjacent.append(neighbour)
+                y = neighbour.box.y + neighbour.box.h if neighbour is not None else box.y + box.h
+
+        return [neighbour for neighbour in adjacent if neighbour is not None]
+
+    def __init_index(self):
+        leaves = self.__search_children()
+        self.elements_index = {None: leaves}
+
+        for state in Box.State:
+            self.elements_index[frozenset([state])] = QTree.__filter(leaves, [state])
+
+    def __invalidate(self):
+        root = self
+
+        while root.parent is not None:
+            root = root.parent
+
+        root.elements_index = None
+        root.boxes_list = None
+        root.locator = None
+
+    @staticmethod
+    def __filter(candidates: list['QTree'], states):
+        if states is None:
+            return candidates
+
+        elements = []
+
+        for node in candidates:
+            if node.box.state in states:
+                elements.append(node)
+
+        return elements
+
+    def __indexed_get(self, x, y):
+        if self.locator is None:
+            self.locator_leaves = self.elements()
+            self.locator = Locator(Lattice.from_boxes(self.boxes(self.locator_leaves)))
+
+        index = self.locator.get(x, y)
+        return self.locator_leaves[index] if index is not None else None
+
+    def __descend(self, x, y):
+        node = self if self.box.contains(x, y) else None
+
+        while node is not None and not node.is_leaf():
+            node = next((child for child in node.children if child.box.contains(x, y)), None)
+
+        return node
 
     def __search_children(self):
         if self.is_leaf():
@@ -514,3 +1002,202 @@ class QTree(AbstractData):
                     candidates.append(candidate.children[QTree.Child.SE])
 
         return neighbours
+
+
+class LinearQTree(AbstractData):
+    def __init__(self, pixels: np.ndarray, x, y, w, h):
+        super().__init__(pixels)
+        self.box = Box(x, y, w, h)
+        self.x = np.empty(0, dtype=np.int32)
+        self.y = np.empty(0, dtype=np.int32)
+        self.w = np.empty(0, dtype=np.int32)
+        self.h = np.empty(0, dtype=np.int32)
+        self.state = np.empty(0, dtype=np.uint8)
+        self.depth = np.empty(0, dtype=np.uint8)
+        self.code = np.empty(0, dtype=np.uint64)
+        self.codes: dict[int, int] = {}
+        self.locator: Locator | None = None
+        self.boxes_list: list[Box] | None = None
+
+    def __len__(self):
+        return len(self.state)
+
+    def get(self, x, y):
+        if not self.box.contains(x, y):
+            return None
+
+        if Config.QTree.INDEXED:
+            return self.locator.get(x, y)
+
+        node_x, node_y, node_w, node_h = self.box.x, self.box.y, self.box.w, self.box.h
+        code = 1
+
+        while code not in self.codes:
+            half_w = node_w // 2
+            half_h = node_h // 2
+            child = QTree.Child.NW
+
+            if x >= node_x + half_w:
+                node_x, node_w = node_x + half_w, half_w + node_w % 2
+                child |= QTree.Child.NE
+            else:
+                node_w = half_w
+
+            if y >= node_y + half_h:
+                node_y, node_h = node_y + half_h, half_h + node_h % 2
+                child |= QTree.Child.SW
+            else:
+                node_h = half_h
+
+            code = code << 2 | child
+
+        return self.codes[code]
+
+    def elements(self, states=None):
+        if states is None:
+            return np.arange(len(self))
+
+        indexes = [state.index for state in states]
+        return np.flatnonzero(np.isin(self.state, indexes))
+
+    def boxes(self, targets=None):
+        if self.boxes_list is None:
+            self.__init_boxes()
+
+        if targets is None:
+            return self.boxes_list
+
+        boxes = []
+
+        for target in targets:
+            boxes.append(self.boxes_list[target])
+
+        return boxes
+
+    def center(self, element: int):
+        return self.x[element].item() + self.w[element].item() // 2, self.y[element].item() + self.h[element].item() // 2
+
+    def divide(self):
+        integral = Integral(self.pixels) if Config.QTree.INTEGRAL else None
+        leaves = []
+        candidates = [(self.box.x, self.box.y, self.box.w, self.box.h, 0, 1)]
+
+        while candidates:
+            x, y, w, h, depth, code = candidates.pop()
+
+            if integral is not None:
+                state = integral.state(x, y, w, h)
+            else:
+                state = Box.slice_state(self.pixels[y:y + h, x:x + w])
+
+            half_w = w // 2
+            half_h = h // 2
+
+            if state != Box.State.MIXED or half_w < Config.QTree.MIN_SIZE or half_h < Config.QTree.MIN_SIZE:
+                leaves.append((x, y, w, h, state.index, depth, code))
+                continue
+
+            candidates.append((x + half_w, y + half_h, half_w + w % 2, half_h + h % 2, depth + 1, code << 2 | QTree.Child.SE))
+            candidates.append((x, y + half_h, half_w, half_h + h % 2, depth + 1, code << 2 | QTree.Child.SW))
+            candidates.append((x + half_w, y, half_w + w % 2, half_h, depth + 1, code << 2 | QTree.Child.NE))
+            candidates.append((x, y, half_w, half_h, depth + 1, code << 2 | QTree.Child.NW))
+
+        self.set_leaves(*zip(*leaves))
+
+    def set_leaves(self, x, y, w, h, state, depth, code):
+        self.x = np.array(x, dtype=np.int32)
+        self.y = np.array(y, dtype=np.int32)
+        self.w = np.array(w, dtype=np.int32)
+        self.h = np.array(h, dtype=np.int32)
+        self.state = np.array(state, dtype=np.uint8)
+        self.depth = np.array(depth, dtype=np.uint8)
+        self.code = np.array(code, dtype=np.uint64)
+        self.codes = {code: index for index, code in enumerate(self.code.tolist())}
+        self.locator = Locator(Lattice(self.x, self.y, self.w, self.h))
+        self.boxes_list = None
+
+    def neighbour(self, element: int, direction: AbstractData.Direction, options=None):
+        if AbstractData.diagonal(options) and direction.is_diagonal():
+            diagonal_neighbour = self.__diagonal_neighbour(element, direction)
+            return [diagonal_neighbour] if diagonal_neighbour is not None else []
+
+        return self.__cardinal_neighbours(element, direction)
+
+    def neighbours(self, element: int, options=None):
+        neighbours = set()
+
+        for direction in AbstractData.Direction:
+            direction_neighbours = self.neighbour(element, direction, options)
+
+            for neighbour in direction_neighbours:
+                neighbours.add(neighbour)
+
+        return neighbours
+
+    def cost(self, start: int, end: int, options=None):
+        cost = self.distance(self.center(start), self.center(end), options)
+        return cost if self.risk is None else cost * self.risk.factor(start, end)
+
+    def heuristic(self, start: int, end: int, options=None):
+        distance = self.distance(self.center(start), self.center(end), options)
+        return max(distance, self.landmark_bound(start, end, options))
+
+    def __check(self, element):
+        return element is not None and self.state[element] == Box.State.SAFE.index
+
+    def __cardinal_neighbours(self, element: int, direction: AbstractData.Direction):
+        x, y = self.x[element].item(), self.y[element].item()
+        w, h = self.w[element].item(), self.h[element].item()
+
+        match direction:
+            case AbstractData.Direction.N:
+                candidates = self.__edge_neighbours(x, x + w, lambda position: (position, y - 1), self.x, self.w)
+            case AbstractData.Direction.E:
+                candidates = self.__edge_neighbours(y, y + h, lambda position: (x + w, position), self.y, self.h)
+            case AbstractData.Direction.S:
+                candidates = self.__edge_neighbours(x, x + w, lambda position: (position, y + h), self.x, self.w)
+            case AbstractData.Direction.W:
+                candidates = self.__edge_neighbours(y, y + h, lambda position: (x - 1, position), self.y, self.h)
+            case _:
+                candidates = []
+
+        return [candidate for candidate in candidates if self.__check(candidate)]
+
+    def __edge_neighbours(self, begin, end, point, offsets, sizes):
+        neighbours = []
+        position = begin
+
+        while position < end:
+            neighbour = self.get(*point(position))
+
+            if neighbour is None:
+                break
+
+            neighbours.append(neighbour)
+            position = offsets[neighbour].item() + sizes[neighbour].item()
+
+        return neighbours
+
+    def __diagonal_neighbour(self, element: int, direction: AbstractData.Direction):
+        x, y = self.x[element].item(), self.y[element].item()
+        w, h = self.w[element].item(), self.h[element].item()
+        candidate = None
+
+        match direction:
+            case AbstractData.Direction.NW:
+                candidate = self.get(x - 1, y - 1)
+            case AbstractData.Direction.NE:
+                candidate = self.get(x + w, y - 1)
+            case AbstractData.Direction.SE:
+                candidate = self.get(x + w, y + h)
+            case AbstractData.Direction.SW:
+                candidate = self.get(x - 1, y + h)
+
+        return candidate if self.__check(candidate) else None
+
+    def __init_boxes(self):
+        states = list(Box.State)
+        self.boxes_list = []
+
+        for x, y, w, h, state in zip(self.x.tolist(), self.y.tolist(), self.w.tolist(), self.h.tolist(), self.state.tolist()):
+            self.boxes_list.append(Box(x, y, w, h, states[state]))
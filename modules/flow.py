@@ -0,0 +1,146 @@
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from config import Config
+from modules.data import AbstractData, Box, Grid, LinearQTree
+from modules.graph import Graph
+from modules.options import SearchOptions
+
+
+class FlowField:
+    def __init__(self, data: AbstractData, goal, options: SearchOptions):
+        self.data = data
+        self.goal = goal
+        self.options = options
+        self.version = data.version
+
+        if isinstance(data, Graph):
+            self.nodes = range(len(data))
+            self.ids = None
+        else:
+            self.nodes = Graph.nodes_of(data)
+            self.ids = None if isinstance(data, (Grid, LinearQTree)) else {node: index for index, node in enumerate(self.nodes)}
+
+        self.distances, self.next_hops = self.__search()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def distance(self, element):
+        if element is None:
+            return math.inf
+
+        return float(self.distances[self.__index(element)])
+
+    def path(self, start):
+        if start is None:
+            return None
+
+        if start == self.goal:
+            return [start]
+
+        current = self.__index(start)
+
+        if not np.isfinite(self.distances[current]):
+            current = self.__first_hop(start)
+
+            if current is None:
+                return None
+
+            path = [start, self.nodes[current]]
+        else:
+            path = [start]
+
+        while self.next_hops[current] >= 0:
+            current = int(self.next_hops[current])
+            path.append(self.nodes[current])
+
+        path.reverse()
+        return path
+
+    def __search(self):
+        distances = [math.inf] * len(self.nodes)
+        next_hops = [-1] * len(self.nodes)
+
+        if self.goal is not None and self.data.boxes([self.goal])[0].state == Box.State.SAFE:
+            goal = self.__index(self.goal)
+            distances[goal] = 0
+            closed = [False] * len(self.nodes)
+            priority_queue = [(0, goal)]
+
+            while priority_queue:
+                cost, current = heapq.heappop(priority_queue)
+
+                if closed[current]:
+                    continue
+
+                closed[current] = True
+
+                for neighbour, weight in self.__edges(current):
+                    if cost + weight < distances[neighbour]:
+                        distances[neighbour] = cost + weight
+                        next_hops[neighbour] = current
+                        heapq.heappush(priority_queue, (cost + weight, neighbour))
+
+        return np.array(distances), np.array(next_hops, dtype=np.int64)
+
+    def __edges(self, index):
+        if isinstance(self.data, (Grid, Graph)):
+            return self.data.edges(index, self.options)
+
+        node = self.nodes[index]
+        return [(self.__index(neighbour), self.data.cost(node, neighbour, self.options))
+                for neighbour in self.data.neighbours(node, self.options)]
+
+    def __first_hop(self, start):
+        best_cost, best = math.inf, None
+
+        for neighbour in self.data.neighbours(start, self.options):
+            index = self.__index(neighbour)
+            cost = self.data.cost(start, neighbour, self.options) + self.distances[index]
+
+            if cost < best_cost:
+                best_cost, best = cost, index
+
+        return best
+
+    def __index(self, element):
+        return element if self.ids is None else self.ids[element]
+
+
+class FlowFields:
+    def __init__(self, data: AbstractData, options: SearchOptions | None = None, capacity=Config.FlowField.CAPACITY):
+        assert capacity > 0, 'Invalid capacity'
+
+        self.data = data
+        self.options = options if options is not None else SearchOptions.of(data)
+        self.capacity = capacity
+        self.version = data.version
+        self.fields: OrderedDict[object, FlowField] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.fields)
+
+    def field(self, goal) -> FlowField:
+        if self.version != self.data.version:
+            self.fields.clear()
+            self.version = self.data.version
+
+        if goal in self.fields:
+            self.fields.move_to_end(goal)
+            self.hits += 1
+            return self.fields[goal]
+
+        self.misses += 1
+        field = FlowField(self.data, goal, self.options)
+        self.fields[goal] = field
+
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+
+        return field
@@ -0,0 +1,238 @@
+import numpy as np
+
+from config import Config
+from modules.data import AbstractData, Grid
+from modules.options import SearchOptions
+
+
+class Graph(AbstractData):
+    REMOVED = 255
+
+    def __init__(self, data: AbstractData, adjacency: tuple[np.ndarray, np.ndarray] | None = None,
+                 options: SearchOptions | None = None):
+        super().__init__(data.pixels)
+        self.data = data
+        self.options = options if options is not None else SearchOptions.of(data)
+        self.distance_method = self.options.distance_method
+        self.allow_diagonal = self.options.allow_diagonal
+        self.nodes = Graph.nodes_of(data)
+        self.ids = {node: index for index, node in enumerate(self.nodes)}
+        self.points = [box.center() for box in data.boxes(self.nodes)]
+        self.centers = np.array(self.points, dtype=np.int64).reshape(-1, 2)
+        self.states = np.array([box.state.index for box in data.boxes(self.nodes)], dtype=np.uint8)
+        self.indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        self.weights: dict[AbstractData.DistanceMethod, np.ndarray] = {}
+        self.quantized_weights: dict[AbstractData.DistanceMethod, np.ndarray] = {}
+        self.quantized_slack: dict[AbstractData.DistanceMethod, float] = {}
+        self.weights_risk = None
+
+        if adjacency is not None:
+            self.indptr = adjacency[0].astype(np.int64)
+            self.indices = adjacency[1].astype(np.int32)
+        else:
+            self.__compile()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get(self, x, y):
+        element = self.data.get(x, y)
+
+        if element is None:
+            return None
+
+        return self.ids.get(element)
+
+    def elements(self, states=None):
+        if states is None:
+            return np.flatnonzero(self.states != Graph.REMOVED).tolist()
+
+        indexes = [state.index for state in states]
+        return np.flatnonzero(np.isin(self.states, indexes)).tolist()
+
+    def boxes(self, targets=None):
+        if targets is None:
+            return self.data.boxes()
+
+        return self.data.boxes([self.nodes[target] for target in targets])
+
+    def neighbour(self, element: int, direction: AbstractData.Direction, options=None):
+        neighbours = self.data.neighbour(self.nodes[element], direction, self.__options(options))
+
+        if neighbours is None:
+            return []
+
+        if not isinstance(neighbours, list):
+            neighbours = [neighbours]
+
+        return [self.ids[neighbour] for neighbour in neighbours]
+
+    def neighbours(self, element: int, options=None):
+        return self.indices[self.indptr[element]:self.indptr[element + 1]].tolist()
+
+    def edges(self, element: int, options=None):
+        weights = self.edge_weights(options)
+        begin, end = self.indptr[element], self.indptr[element + 1]
+
+        return zip(self.indices[begin:end].tolist(), weights[begin:end].tolist())
+
+    def quantized_edges(self, element: int, options=None):
+        weights = self.edge_weights(options, quantized=True)
+        begin, end = self.indptr[element], self.indptr[element + 1]
+
+        return zip(self.indices[begin:end].tolist(), weights[begin:end].tolist())
+
+    def edge_weights(self, options=None, quantized=False):
+        assert options is None or options.allow_diagonal == self.allow_diagonal, 'Invalid options'
+        distance_method = self.distance_method if options is None else options.distance_method
+        risk = (self.data.risk, self.data.risk.version) if self.data.risk is not None else None
+
+        if risk != self.weights_risk:
+            self.weights = {}
+            self.quantized_weights = {}
+            self.quantized_slack = {}
+            self.weights_risk = risk
+
+        if distance_method not in self.weights:
+            self.weights[distance_method] = self.__compile_weights(distance_method)
+
+        if not quantized:
+            return self.weights[distance_method]
+
+        if distance_method not in self.quantized_weights:
+            self.quantized_weights[distance_method] = np.ceil(self.weights[distance_method] * Config.Risk.RESOLUTION).astype(np.int64)
+
+        return self.quantized_weights[distance_method]
+
+    def quantization_slack(self, options=None):
+        weights = self.edge_weights(options)
+        quantized = self.edge_weights(options, quantized=True)
+        distance_method = self.distance_method if options is None else options.distance_method
+
+        if distance_method not in self.quantized_slack:
+            positive = weights > 0
+            self.quantized_slack[distance_method] = float(np.max(quantized[positive] / (weights[positive] * Config.Risk.RESOLUTION), initial=1.0))
+
+        return self.quantized_slack[distance_method]
+
+    def cost(self, start: int, end: int, options=None):
+        cost = self.distance(self.points[start], self.points[end], options)
+        return cost if self.data.risk is None else cost * self.data.risk.factor(self.nodes[start], self.nodes[end])
+
+    def heuristic(self, start: int, end: int, options=None):
+        return max(self.distance(self.points[start], self.points[end], options), self.landmark_bound(start, end, options))
+
+    def patch(self, removed, dirty):
+        patched = []
+
+        for element in removed:
+            index = self.ids.pop(element, None)
+
+            if index is not None:
+                self.nodes[index] = None
+                patched.append(index)
+
+        for element in dirty:
+            if element not in self.ids:
+                self.ids[element] = len(self.nodes)
+                self.nodes.append(element)
+                self.points.append(None)
+
+            patched.append(self.ids[element])
+
+        states = np.full(len(self.nodes), Graph.REMOVED, dtype=np.uint8)
+        states[:len(self.states)] = self.states
+        centers = np.zeros((len(self.nodes), 2), dtype=np.int64)
+        centers[:len(self.centers)] = self.centers
+
+        rows = []
+
+        for index in patched:
+            node = self.nodes[index]
+
+            if node is None:
+                states[index] = Graph.REMOVED
+                continue
+
+            box = self.data.boxes([node])[0]
+            self.points[index] = box.center()
+            centers[index] = self.points[index]
+            states[index] = box.state.index
+            rows.append((index, sorted(self.ids[neighbour] for neighbour in self.data.neighbours(node, self.options))))
+
+        mask = np.zeros(len(self.nodes), dtype=bool)
+        mask[patched] = True
+
+        sources = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        kept = ~mask[sources]
+
+        sources = np.concatenate([sources[kept]] + [np.full(len(row), index) for index, row in rows])
+        indices = np.concatenate([self.indices[kept]] + [np.array(row, dtype=np.int32) for _, row in rows])
+        order = np.argsort(sources, kind='stable')
+
+        self.centers = centers
+        self.states = states
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=len(self.nodes)))]).astype(np.int64)
+        self.indices = indices[order].astype(np.int32)
+        self.weights = {}
+        self.quantized_weights = {}
+        self.quantized_slack = {}
+        self.version += 1
+
+    @staticmethod
+    def nodes_of(data: AbstractData):
+        if isinstance(data, Grid):
+            return list(range(len(data.boxes())))
+
+        elements = data.elements()
+
+        if isinstance(elements, np.ndarray):
+            return elements.tolist()
+
+        return list(elements)
+
+    def __compile(self):
+        if isinstance(self.data, Grid):
+            self.__compile_grid()
+            return
+
+        indptr = [0]
+        indices = []
+
+        for node in self.nodes:
+            neighbours = sorted(self.ids[neighbour] for neighbour in self.data.neighbours(node, self.options))
+            indices.extend(neighbours)
+            indptr.append(len(indices))
+
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int32)
+
+    def __compile_grid(self):
+        sources, targets, _ = self.data.frontier(np.arange(len(self.nodes)), self.options)
+        order = np.lexsort((targets, sources))
+
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=len(self.nodes)))]).astype(np.int64)
+        self.indices = targets[order].astype(np.int32)
+
+    def __compile_weights(self, distance_method: AbstractData.DistanceMethod):
+        sources = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        delta = np.abs(self.centers[sources] - self.centers[self.indices]).astype(np.float64)
+
+        match distance_method:
+            case AbstractData.DistanceMethod.EUCLIDIAN:
+                weights = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+            case AbstractData.DistanceMethod.MANHATTAN:
+                weights = delta[:, 0] + delta[:, 1]
+
+        if self.data.risk is None:
+            return weights
+
+        live = [index for index, node in enumerate(self.nodes) if node is not None]
+        multipliers = np.ones(len(self.nodes))
+        multipliers[live] = self.data.risk.multipliers_of([self.nodes[index] for index in live])
+
+        return weights * (multipliers[sources] + multipliers[self.indices]) / 2
+
+    def __options(self, options):
+        return options if options is not None else self.options
@@ -0,0 +1,185 @@
+import math
+import threading
+
+
+class IndexedHeap:
+    shared_heaps = threading.local()
+
+    def __init__(self, size):
+        self.size = size
+        self.priority = [math.inf] * size
+        self.cost = [math.inf] * size
+        self.parent = [-1] * size
+        self.position = [-1] * size
+        self.closed = [False] * size
+        self.heap = [0] * size
+        self.touched = [0] * size
+        self.length = 0
+        self.touched_length = 0
+
+    def __len__(self):
+        return self.length
+
+    @staticmethod
+    def shared(size):
+        if not hasattr(IndexedHeap.shared_heaps, 'heaps'):
+            IndexedHeap.shared_heaps.heaps = {}
+
+        heaps: dict[int, IndexedHeap] = IndexedHeap.shared_heaps.heaps
+
+        if size not in heaps:
+            heaps[size] = IndexedHeap(size)
+
+        heap = heaps[size]
+        heap.reset()
+
+        return heap
+
+    def reset(self):
+        for node in self.touched[:self.touched_length]:
+            self.priority[node] = math.inf
+            self.cost[node] = math.inf
+            self.parent[node] = -1
+            self.position[node] = -1
+            self.closed[node] = False
+
+        self.length = 0
+        self.touched_length = 0
+
+    def touch(self, node, cost, parent):
+        if self.cost[node] == math.inf:
+            self.touched[self.touched_length] = node
+            self.touched_length += 1
+
+        self.cost[node] = cost
+        self.parent[node] = parent
+
+    def push(self, node, priority):
+        position = self.position[node]
+
+        if position < 0:
+            position = self.length
+            self.length += 1
+        elif priority >= self.priority[node]:
+            self.priority[node] = priority
+            self.__sift_down(position)
+            return
+
+        self.priority[node] = priority
+        self.__sift_up(node, position)
+
+    def pop(self):
+        node = self.heap[0]
+        self.length -= 1
+        self.position[node] = -1
+        self.closed[node] = True
+
+        if self.length > 0:
+            last = self.heap[self.length]
+            self.heap[0] = last
+            self.position[last] = 0
+            self.__sift_down(0)
+
+        return node
+
+    def path(self, end):
+        path = []
+        current = end
+
+        while current >= 0:
+            path.append(current)
+            current = self.parent[current]
+
+        return path
+
+    def __sift_up(self, node, position):
+        heap, position_of, priority_of = self.heap, self.position, self.priority
+        priority = priority_of[node]
+
+        while position > 0:
+            parent_position = (position - 1) >> 1
+            parent = heap[parent_position]
+
+            if priority_of[parent] <= priority:
+                break
+
+            heap[position] = parent
+            position_of[parent] = position
+            position = parent_position
+
+        heap[position] = node
+        position_of[node] = position
+
+    def __sift_down(self, position):
+        heap, position_of, priority_of = self.heap, self.position, self.priority
+        node = heap[position]
+        priority = priority_of[node]
+        length = self.length
+
+        while True:
+            child_position = 2 * position + 1
+
+            if child_position >= length:
+                break
+
+            child = heap[child_position]
+
+            if child_position + 1 < length and priority_of[heap[child_position + 1]] < priority_of[child]:
+                child_position += 1
+                child = heap[child_position]
+
+            if priority_of[child] >= priority:
+                break
+
+            heap[position] = child
+            position_of[child] = position
+            position = child_position
+
+        heap[position] = node
+        position_of[node] = position
+
+
+class BucketQueue:
+    SCAN = 64
+
+    def __init__(self):
+        self.buckets: dict[int, list] = {}
+        self.cursor = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def push(self, item, priority: int):
+        if self.length == 0 or priority < self.cursor:
+            self.cursor = priority
+
+        bucket = self.buckets.get(priority)
+
+        if bucket is None:
+            self.buckets[priority] = [item]
+        else:
+            bucket.append(item)
+
+        self.length += 1
+
+    def pop(self):
+        steps = 0
+
+        while self.cursor not in self.buckets:
+            if steps == BucketQueue.SCAN:
+                self.cursor = min(self.buckets)
+                break
+
+            self.cursor += 1
+            steps += 1
+
+        bucket = self.buckets[self.cursor]
+        item = bucket.pop()
+
+        if not bucket:
+            del self.buckets[self.cursor]
+
+        self.length -= 1
+
+        return item
@@ -0,0 +1,188 @@
+import heapq
+
+import numpy as np
+
+from config import Config
+from modules.data import Box, QTree, LinearQTree
+from modules.graph import Graph
+from modules.options import SearchOptions
+
+
+class Hierarchy:
+    def __init__(self, graph: Graph, options: SearchOptions | None = None):
+        self.graph = graph
+        self.options = options if options is not None else graph.options
+        self.distance_method = None
+        self.clusters: list[int] = []
+        self.entrances: dict[int, list[int]] = {}
+        self.edges: dict[int, dict[int, float]] = {}
+        self.paths: dict[tuple[int, int], list[int]] = {}
+        self.version = None
+
+        self.build()
+
+    def build(self):
+        self.distance_method = self.options.distance_method
+        self.version = (self.graph.data.version, self.graph.version)
+        self.clusters = Hierarchy.clusters_of(self.graph)
+        self.entrances = {}
+        self.edges = {}
+        self.paths = {}
+
+        for source, target, weight in self.__portals():
+            for entrance in [source, target]:
+                if entrance not in self.edges:
+                    self.edges[entrance] = {}
+                    self.entrances.setdefault(self.clusters[entrance], []).append(entrance)
+
+            self.__connect(source, target, weight, [target, source])
+            self.__connect(target, source, weight, [source, target])
+
+        for cluster, entrances in self.entrances.items():
+            for entrance in entrances:
+                costs, visited, _ = self.search(entrance, {cluster}, set(entrances))
+
+                for target in entrances:
+                    if target != entrance and target in costs:
+                        self.__connect(entrance, target, costs[target], Hierarchy.build_path(visited, target))
+
+    def search(self, source, clusters: set[int], targets: set[int], end=None, weight=1.0):
+        costs = {source: 0}
+        visited = {source: None}
+        priority_queue = [(0, source)]
+        closed = set()
+        remaining = len(targets - {source})
+
+        while priority_queue and remaining:
+            current = heapq.heappop(priority_queue)[1]
+
+            if current in closed:
+                continue
+
+            closed.add(current)
+
+            if current in targets and current != source:
+                remaining -= 1
+
+            for neighbour, edge_cost in self.graph.edges(current, self.options):
+                if self.clusters[neighbour] not in clusters:
+                    continue
+
+                cost = costs[current] + edge_cost
+
+                if neighbour not in costs or cost < costs[neighbour]:
+                    costs[neighbour] = cost
+                    visited[neighbour] = current
+                    priority = cost if end is None else cost + weight * self.graph.heuristic(neighbour, end, self.options)
+                    heapq.heappush(priority_queue, (priority, neighbour))
+
+        return {target: costs[target] for target in targets if target in closed}, visited, len(closed)
+
+    def valid(self):
+        return self.version == (self.graph.data.version, self.graph.version)
+
+    @staticmethod
+    def build_path(visited, target):
+        path = []
+        current = target
+
+        while current is not None:
+            path.append(current)
+            current = visited[current]
+
+        return path
+
+    @staticmethod
+    def clusters_of(graph: Graph):
+        data = graph.data
+
+        if isinstance(data, QTree):
+            ancestors: dict[QTree, int] = {}
+            clusters = []
+
+            for node in graph.nodes:
+                if node is None:
+                    clusters.append(-1)
+                    continue
+
+                while node.depth > Config.Hierarchy.DEPTH:
+                    node = node.parent
+
+                clusters.append(ancestors.setdefault(node, len(ancestors)))
+
+            return clusters
+
+        if isinstance(data, LinearQTree):
+            nodes = np.array([node if node is not None else 0 for node in graph.nodes], dtype=np.int64)
+            shift = 2 * np.maximum(data.depth[nodes].astype(np.int64) - Config.Hierarchy.DEPTH, 0)
+
+            return (data.code[nodes] >> shift.astype(np.uint64)).astype(np.int64).tolist()
+
+        size = Config.Hierarchy.CLUSTER_SIZE
+        columns = -(-data.pixels.shape[1] // size)
+
+        return ((graph.centers[:, 1] // size) * columns + graph.centers[:, 0] // size).tolist()
+
+    def __portals(self):
+        sources = np.repeat(np.arange(len(self.graph)), np.diff(self.graph.indptr))
+        targets = self.graph.indices.astype(np.int64)
+        clusters = np.array(self.clusters, dtype=np.int64)
+        safe = self.graph.states == Box.State.SAFE.index
+
+        crossing = (clusters[sources] < clusters[targets]) & safe[sources] & safe[targets]
+        sides: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+        for source, target in zip(sources[crossing].tolist(), targets[crossing].tolist()):
+            sides.setdefault((self.clusters[source], self.clusters[target]), []).append((source, target))
+
+        portals = []
+
+        for crossings in sides.values():
+            for component in self.__components(crossings):
+                source, target = self.__representative(component)
+                portals.append((source, target, self.graph.cost(source, target, self.options)))
+
+        return portals
+
+    def __components(self, crossings: list[tuple[int, int]]):
+        parents = list(range(len(crossings)))
+
+        def find(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+
+            return index
+
+        sources: dict[int, list[int]] = {}
+
+        for index, (source, _) in enumerate(crossings):
+            sources.setdefault(source, []).append(index)
+
+        for index, (source, target) in enumerate(crossings):
+            targets = set(self.graph.neighbours(target)) | {target}
+
+            for neighbour in self.graph.neighbours(source) + [source]:
+                for other in sources.get(neighbour, []):
+                    if crossings[other][1] in targets:
+                        parents[find(index)] = find(other)
+
+        components: dict[int, list[tuple[int, int]]] = {}
+
+        for index, crossing in enumerate(crossings):
+            components.setdefault(find(index), []).append(crossing)
+
+        return list(components.values())
+
+    def __representative(self, component: list[tuple[int, int]]):
+        middles = self.graph.centers[[source for source, _ in component]] + self.graph.centers[[target for _, target in component]]
+        distances = np.abs(middles - middles.mean(axis=0)).sum(axis=1)
+
+        return component[int(np.argmin(distances))]
+
+    def __connect(self, source, target, cost, path):
+        if target in self.edges[source] and self.edges[source][target] <= cost:
+            return
+
+        self.edges[source][target] = cost
+        self.paths[source, target] = path
@@ -5,12 +5,13 @@ from PIL import Image as im
 from PIL import ImageDraw as imdraw
 
 from config import Config
-from modules.data import AbstractData
+from modules.data import AbstractData, Box
 from modules.pathfinder import PathfinderInfo
 
 
 class Image:
     def __init__(self, path):
+        self.path = path
         image = im.open(path).convert('RGB')
         self.pixels = np.asarray(image)
 
@@ -21,10 +22,14 @@ class Image:
         return self.pixels.shape[0]
 
     def save(self, data: AbstractData, image_path, info: PathfinderInfo | None = None):
-        image = im.new('RGB', (self.pixels.shape[1], self.pixels.shape[0]))
-        image_draw = imdraw.Draw(image)
-
-        self.__draw_boxes(image_draw, data, info)
+        if Config.Image.FAST:
+            image = self.__paint_boxes(data, info)
+            image_draw = imdraw.Draw(image)
+            self.__draw_borders(image_draw, data)
+        else:
+            image = im.new('RGB', (self.pixels.shape[1], self.pixels.shape[0]))
+            image_draw = imdraw.Draw(image)
+            self.__draw_boxes(image_draw, data, info)
 
         if info is not None and info.points is not None:
             self.__draw_points(image_draw, info)
@@ -49,6 +54,36 @@ class Image:
 
             image_draw.rectangle((x0, y0, x1, y1), fill=color, outline=Config.Color.BORDER, width=Config.Image.BORDER)
 
+    def __paint_boxes(self, data: AbstractData, info: PathfinderInfo | None = None):
+        palette = [(0, 0, 0), Config.Color.VISITED, Config.Color.PATH] + [state.color for state in Box.State]
+        canvas = np.zeros((self.pixels.shape[0], self.pixels.shape[1]), dtype=np.uint8)
+
+        visited_boxes = set(info.visited_boxes) if info is not None and info.visited_boxes is not None else set()
+        path_boxes = set(info.path_boxes) if info is not None and info.path_boxes is not None else set()
+
+        for box in data.boxes():
+            color = box.state.color
+
+            if box in visited_boxes:
+                color = Config.Color.VISITED
+
+            if box in path_boxes:
+                color = Config.Color.PATH
+
+            canvas[box.y:box.y + box.h, box.x:box.x + box.w] = palette.index(color)
+
+        image = im.fromarray(canvas)
+        image.putpalette(list(itertools.chain.from_iterable(palette)))
+
+        return image
+
+    def __draw_borders(self, image_draw, data: AbstractData):
+        for box in data.boxes():
+            x0, y0 = box.x, box.y
+            x1, y1 = box.x + box.w - 1, box.y + box.h - 1
+
+            image_draw.rectangle((x0, y0, x1, y1), outline=Config.Color.BORDER, width=Config.Image.BORDER)
+
     def __draw_points(self, image_draw, info):
         for point in info.points:
             self.__draw_point(image_draw, point)
@@ -0,0 +1,81 @@
+import heapq
+
+import numpy as np
+
+from config import Config
+from modules.data import AbstractData, Box
+from modules.graph import Graph
+
+
+class Landmarks:
+    UNREACHABLE = 1e12
+
+    def __init__(self, graph: Graph, tables: tuple[np.ndarray, np.ndarray] | None = None, count=Config.Landmarks.COUNT):
+        self.graph = graph
+        self.distance_method = graph.distance_method
+        self.allow_diagonal = graph.allow_diagonal
+        self.risk = graph.data.risk
+        self.version = (graph.data.version, graph.version)
+        self.safe = (graph.states == Box.State.SAFE.index).tolist()
+
+        if tables is not None:
+            self.landmarks = tables[0].astype(np.int64)
+            self.distances = tables[1].astype(np.float64)
+        else:
+            self.landmarks, self.distances = self.__select(count)
+
+        self.table = np.where(np.isfinite(self.distances), self.distances, Landmarks.UNREACHABLE).T.copy()
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def valid(self, data: AbstractData, options=None):
+        distance_method = data.distance_method if options is None else options.distance_method
+        return (self.distance_method == distance_method and self.allow_diagonal == AbstractData.diagonal(options) and
+                self.risk is self.graph.data.risk and self.version == (self.graph.data.version, self.graph.version))
+
+    def heuristic(self, start: int, end: int):
+        if not self.safe[start] or not self.safe[end]:
+            return 0
+
+        return float(np.abs(self.table[start] - self.table[end]).max())
+
+    def search(self, source):
+        distances = np.full(len(self.graph), np.inf)
+        distances[source] = 0
+        priority_queue = [(0, source)]
+
+        while priority_queue:
+            cost, current = heapq.heappop(priority_queue)
+
+            if cost > distances[current]:
+                continue
+
+            for neighbour, weight in self.graph.edges(current):
+                if cost + weight < distances[neighbour]:
+                    distances[neighbour] = cost + weight
+                    heapq.heappush(priority_queue, (cost + weight, neighbour))
+
+        return distances
+
+    def __select(self, count):
+        candidates = np.flatnonzero(self.graph.states == Box.State.SAFE.index)
+
+        if len(candidates) == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, len(self.graph)))
+
+        landmarks = []
+        distances = []
+        nearest = self.search(int(candidates[0]))
+
+        for _ in range(min(count, len(candidates))):
+            landmarks.append(Landmarks.__farthest(candidates, nearest))
+            distances.append(self.search(landmarks[-1]))
+            nearest = distances[-1] if len(landmarks) == 1 else np.minimum(nearest, distances[-1])
+
+        return np.array(landmarks, dtype=np.int64), np.array(distances)
+
+    @staticmethod
+    def __farthest(candidates: np.ndarray, distances: np.ndarray):
+        distances = np.where(np.isfinite(distances[candidates]), distances[candidates], Landmarks.UNREACHABLE)
+        return int(candidates[np.argmax(distances)])
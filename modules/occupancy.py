@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+from PIL import Image as im
+
+from config import Config
+from modules.data import Box
+
+
+class Occupancy:
+
+    @staticmethod
+    def convert(image_path, occupancy_path):
+        image = im.open(image_path)
+        width, height = image.size
+
+        occupancy = np.lib.format.open_memmap(occupancy_path, mode='w+', dtype=np.uint8, shape=(height, width))
+
+        for top in range(0, height, Config.Occupancy.TILE):
+            bottom = min(top + Config.Occupancy.TILE, height)
+            pixels = np.asarray(image.crop((0, top, width, bottom)).convert('RGB'))
+            occupancy[top:bottom] = Box.occupancy(pixels)
+
+        occupancy.flush()
+        del occupancy
+
+        return Occupancy.open(occupancy_path)
+
+    @staticmethod
+    def open(occupancy_path):
+        return np.load(occupancy_path, mmap_mode='r')
+
+    @staticmethod
+    def load(image_path, occupancy_path):
+        if os.path.exists(occupancy_path) and os.path.getmtime(occupancy_path) >= os.path.getmtime(image_path):
+            return Occupancy.open(occupancy_path)
+
+        return Occupancy.convert(image_path, occupancy_path)
@@ -0,0 +1,32 @@
+from config import Config
+from modules.data import AbstractData
+
+
+class SearchOptions:
+    def __init__(self, allow_diagonal=None, enable_smoothing=None,
+                 distance_method=AbstractData.DistanceMethod.EUCLIDIAN, heuristic_weight=None, line_of_sight=None):
+        self.allow_diagonal = Config.Path.ALLOW_DIAGONAL if allow_diagonal is None else allow_diagonal
+        self.enable_smoothing = Config.Path.ENABLE_SMOOTHING if enable_smoothing is None else enable_smoothing
+        self.distance_method = distance_method
+        self.heuristic_weight = Config.Path.HEURISTIC_WEIGHT if heuristic_weight is None else heuristic_weight
+        self.line_of_sight = Config.Path.LINE_OF_SIGHT if line_of_sight is None else line_of_sight
+
+        assert self.heuristic_weight >= 1, 'Invalid heuristic weight'
+
+    def __repr__(self):
+        return (f'SearchOptions(allow_diagonal={self.allow_diagonal}, enable_smoothing={self.enable_smoothing}, '
+                f'distance_method={self.distance_method.name}, heuristic_weight={self.heuristic_weight}, '
+                f'line_of_sight={self.line_of_sight})')
+
+    def __eq__(self, other):
+        return isinstance(other, SearchOptions) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self):
+        return self.allow_diagonal, self.enable_smoothing, self.distance_method, self.heuristic_weight, self.line_of_sight
+
+    @staticmethod
+    def of(data: AbstractData):
+        return SearchOptions(distance_method=data.distance_method)
@@ -1,24 +1,44 @@
+import heapq
 import itertools
+import math
 from abc import ABC, abstractmethod
+from enum import Enum
 
 from pqdict import pqdict
-from shapely.geometry import LineString
+from shapely.geometry import LineString, Point
+from shapely.ops import nearest_points
 
 from config import Config
-from modules.data import AbstractData, Grid
+from modules import timer
+from modules.components import Components
+from modules.data import AbstractData, Box, Grid
 from modules.distance import Distance
+from modules.flow import FlowFields
+from modules.graph import Graph
+from modules.heap import BucketQueue, IndexedHeap
+from modules.hierarchy import Hierarchy
+from modules.options import SearchOptions
+from modules.sight import Sight
+from modules.smoothing import Smoothing
 
 
 class PathfinderInfo:
-    def __init__(self, pathfinder_name, start, end):
+    def __init__(self, pathfinder_name, start, end, options: SearchOptions):
         self.pathfinder_name = pathfinder_name
         self.start = start
         self.end = end
+        self.options = options
         self.path = None
         self.visited = None
         self.path_boxes = None
         self.visited_boxes = None
         self.points = None
+        self.inner_points = None
+        self.expanded = None
+        self.bound = None
+        self.iterations = None
+        self.frontiers = None
+        self.sight_checks = None
 
     def trajectory_length(self):
         trajectory_length = 0
@@ -40,17 +60,19 @@ class PathfinderInfo:
 
         return len(self.visited)
 
-    def set_path(self, data, path):
+    def set_path(self, data, path, points=None):
         if path is None:
             return
 
         self.path = path
         self.path_boxes = data.boxes(path)
 
-        self.__set_trajectory_points()
+        if points is not None:
+            self.points = points
+            return
 
-        if Config.Path.ENABLE_SMOOTHING:
-            self.__smooth_trajectory()
+        self.inner_points = self.__inner_points()
+        self.__set_trajectory_points(data)
 
     def set_visited(self, data, visited):
         if visited is None:
@@ -59,19 +81,61 @@ class PathfinderInfo:
         self.visited = visited
         self.visited_boxes = data.boxes(visited)
 
-    def __set_trajectory_points(self):
-        self.points = [self.end]
+    def moved(self, data, start, end):
+        info = PathfinderInfo(self.pathfinder_name, start, end, self.options)
+        info.visited = self.visited
+        info.visited_boxes = self.visited_boxes
+        info.expanded = self.expanded
+        info.bound = self.bound
+        info.iterations = self.iterations
+        info.frontiers = self.frontiers
+        info.sight_checks = self.sight_checks
+
+        if self.path is None:
+            return info
+
+        assert self.inner_points is not None or (start, end) == (self.start, self.end), 'Invalid endpoints'
+
+        info.path = self.path
+        info.path_boxes = self.path_boxes
+        info.inner_points = self.inner_points
+
+        if self.inner_points is None:
+            info.points = self.points
+        else:
+            info.__set_trajectory_points(data)
+
+        return info
+
+    def __inner_points(self):
+        centers = [box.center() for box in self.path_boxes[1:-1]]
+
+        if not self.options.enable_smoothing:
+            return centers
+
+        return self.__smooth(centers, self.path_boxes[1:])[1:-1]
 
-        for box in self.path_boxes[1:-1]:
-            self.points.append(box.center())
+    def __set_trajectory_points(self, data):
+        if not self.options.enable_smoothing:
+            self.points = [self.end] + self.inner_points + [self.start]
+        elif len(self.path_boxes) < 3:
+            self.points = self.__smooth([self.end, self.start], self.path_boxes)
+        else:
+            first = self.__smooth([self.end, self.path_boxes[1].center()], self.path_boxes[:1])
+            last = self.__smooth([self.path_boxes[-2].center(), self.start], self.path_boxes[-2:-1])
+            self.points = first[:-1] + self.inner_points + last[1:]
 
-        self.points.append(self.start)
+        if self.options.line_of_sight:
+            self.points = Smoothing.sight(data.pixels, self.points)
 
-    def __smooth_trajectory(self):
-        smooth_trajectory = [self.end]
+    def __smooth(self, points, boxes):
+        if len(points) < 2 or Config.Path.VECTORIZED_SMOOTHING:
+            return Smoothing.boxes(points, boxes)
 
-        for index, trajectory in enumerate(itertools.pairwise(self.points)):
-            box = self.path_boxes[index]
+        smooth_trajectory = [points[0]]
+
+        for index, trajectory in enumerate(itertools.pairwise(points)):
+            box = boxes[index]
 
             n_line = (box.x, box.y), (box.x + box.w - 1, box.y)
             e_line = (box.x + box.w - 1, box.y), (box.x + box.w - 1, box.y + box.h - 1)
@@ -87,8 +151,8 @@ class PathfinderInfo:
                     smooth_trajectory.append(intersection)
                     break
 
-        smooth_trajectory.append(self.start)
-        self.points = smooth_trajectory
+        smooth_trajectory.append(points[-1])
+        return smooth_trajectory
 
     def __line_intersection(self, l0, l1):
         l0 = LineString(l0)
@@ -99,32 +163,53 @@ class PathfinderInfo:
 
         intersection = l0.intersection(l1)
 
+        if intersection.is_empty:
+            return None
+
+        intersection = nearest_points(Point(l0.coords[0]), intersection)[1]
+
         return round(intersection.x), round(intersection.y)
 
 
 class AbstractPathfinder(ABC):
-    def __init__(self, pathfinder_name, data: AbstractData, start, end):
+    def __init__(self, pathfinder_name, data: AbstractData, start, end, options: SearchOptions | None = None):
         self.data = data
+        self.options = options if options is not None else SearchOptions.of(data)
         self.start = data.get(*start)
         self.end = data.get(*end)
-        self.info = PathfinderInfo(pathfinder_name, start, end)
+        self.info = PathfinderInfo(pathfinder_name, start, end, self.options)
 
     @classmethod
     @abstractmethod
     def search(cls):
         ...
 
+    def reachable(self):
+        if self.start is None or self.end is None:
+            return False
+
+        if not Config.Path.COMPONENTS:
+            return True
+
+        return Components.shared(self.data, self.options).connected(self.start, self.end)
+
     def build_info(self, visited) -> PathfinderInfo:
         self.info.set_visited(self.data, list(visited.keys()))
 
         if self.end not in visited:
             return self.info
 
-        path = self.__build_path(visited)
+        path = self.build_path(visited)
         self.info.set_path(self.data, path)
+        self.info.bound = self.options.heuristic_weight
+        return self.info
+
+    def build_empty_info(self) -> PathfinderInfo:
+        self.info.expanded = 0
+        self.info.set_visited(self.data, [])
         return self.info
 
-    def __build_path(self, visited):
+    def build_path(self, visited):
         path = []
         current = self.end
 
@@ -136,37 +221,739 @@ class AbstractPathfinder(ABC):
 
 
 class AStar(AbstractPathfinder):
-    def __init__(self, data: AbstractData, start, end):
-        super().__init__(type(self).__name__, data, start, end)
+    def __init__(self, data: AbstractData, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, data, start, end, options)
 
     def search(self):
+        if not self.reachable():
+            return self.build_empty_info()
+
         priority_queue = pqdict({self.start: 0})
         cost_so_far = {self.start: 0}
         visited = {self.start: None}
+        weight = self.options.heuristic_weight
+        self.info.expanded = 0
 
         while priority_queue:
             current = priority_queue.popitem()[0]
+            self.info.expanded += 1
 
             if current == self.end:
                 break
 
-            neighbours = self.data.neighbours(current)
+            neighbours = self.data.neighbours(current, self.options)
 
             for neighbour in neighbours:
-                cost = cost_so_far[current] + self.data.cost(current, neighbour)
+                cost = cost_so_far[current] + self.data.cost(current, neighbour, self.options)
+
+                if neighbour not in visited or cost < cost_so_far[neighbour]:
+                    priority_queue[neighbour] = cost + weight * self.data.heuristic(neighbour, self.end, self.options)
+                    cost_so_far[neighbour] = cost
+                    visited[neighbour] = current
+
+        return self.build_info(visited)
+
+
+class ARAStar(AbstractPathfinder):
+    def __init__(self, data: AbstractData, start, end, options: SearchOptions | None = None, deadline=Config.Anytime.DEADLINE):
+        super().__init__(type(self).__name__, data, start, end, options)
+        assert deadline >= 0, 'Invalid deadline'
+        self.deadline = deadline
+        self.heuristics = {}
+
+    def search(self):
+        self.info.iterations = 0
+
+        if not self.reachable():
+            return self.build_empty_info()
+
+        deadline = timer.now() + self.deadline
+        weight = self.options.heuristic_weight
+        cost_so_far = {self.start: 0}
+        visited = {self.start: None}
+        priority_queue = pqdict({self.start: weight * self.__heuristic(self.start)})
+        inconsistent = set()
+        path = None
+        self.info.expanded = 0
+
+        while True:
+            closed = set()
+
+            while priority_queue and cost_so_far.get(self.end, math.inf) > priority_queue.topitem()[1]:
+                if path is not None and timer.now() >= deadline:
+                    break
+
+                current = priority_queue.popitem()[0]
+                closed.add(current)
+                self.info.expanded += 1
+
+                for neighbour in self.data.neighbours(current, self.options):
+                    cost = cost_so_far[current] + self.data.cost(current, neighbour, self.options)
+
+                    if cost < cost_so_far.get(neighbour, math.inf):
+                        cost_so_far[neighbour] = cost
+                        visited[neighbour] = current
+
+                        if neighbour in closed:
+                            inconsistent.add(neighbour)
+                        else:
+                            priority_queue[neighbour] = cost + weight * self.__heuristic(neighbour)
+            else:
+                if self.end in visited:
+                    path = self.build_path(visited)
+                    self.info.iterations += 1
+                    self.info.bound = self.__bound(weight, cost_so_far, priority_queue, inconsistent)
+
+            if path is None or weight == 1 or timer.now() >= deadline:
+                break
+
+            weight = max(1.0, weight - Config.Anytime.STEP)
+            inconsistent.update(priority_queue.keys())
+            priority_queue = pqdict({element: cost_so_far[element] + weight * self.__heuristic(element) for element in inconsistent})
+            inconsistent = set()
+
+        self.info.set_visited(self.data, list(visited.keys()))
+        self.info.set_path(self.data, path)
+
+        return self.info
+
+    def __bound(self, weight, cost_so_far, priority_queue, inconsistent):
+        lower_bound = min((cost_so_far[element] + self.__heuristic(element)
+                           for element in itertools.chain(priority_queue.keys(), inconsistent)), default=math.inf)
+
+        if lower_bound <= 0:
+            return 1.0
+
+        return min(weight, max(1.0, cost_so_far[self.end] / lower_bound))
+
+    def __heuristic(self, element):
+        if element not in self.heuristics:
+            self.heuristics[element] = self.data.heuristic(element, self.end, self.options)
+
+        return self.heuristics[element]
+
+
+class GridAStar(AbstractPathfinder):
+    def __init__(self, data: Grid, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, data, start, end, options)
+        assert isinstance(data, Grid)
+
+    def search(self):
+        if not self.reachable():
+            return self.build_empty_info()
+
+        heap = IndexedHeap.shared(self.data.rows * self.data.columns)
+        heap.touch(self.start, 0, -1)
+        heap.push(self.start, 0)
+        heuristic_weight = self.options.heuristic_weight
+        neighbour_list = self.data.neighbour_list(self.options)
+        step_costs = self.data.step_cost_list(self.options)
+        directions = range(len(AbstractData.Direction) if self.options.allow_diagonal else AbstractData.Direction.NW)
+        multipliers = None
+
+        if self.data.risk is not None:
+            self.data.risk.refresh()
+            multipliers = self.data.risk.values
+
+        self.info.expanded = 0
+
+        while len(heap):
+            current = heap.pop()
+            self.info.expanded += 1
+
+            if current == self.end:
+                break
+
+            current_cost = heap.cost[current]
+            neighbours = neighbour_list[current]
+
+            for direction in directions:
+                neighbour = neighbours[direction]
+
+                if neighbour < 0 or heap.closed[neighbour]:
+                    continue
+
+                weight = step_costs[direction]
+
+                if multipliers is not None:
+                    weight = weight * (multipliers[neighbour] + multipliers[current]) / 2
+
+                cost = current_cost + weight
+
+                if cost < heap.cost[neighbour]:
+                    heap.touch(neighbour, cost, current)
+                    heap.push(neighbour, cost + heuristic_weight * self.data.heuristic(neighbour, self.end, self.options))
+
+        self.info.set_visited(self.data, heap.touched[:heap.touched_length])
+
+        if heap.cost[self.end] < math.inf:
+            self.info.set_path(self.data, heap.path(self.end))
+            self.info.bound = heuristic_weight
+
+        return self.info
+
+
+class BidirectionalAStar(AbstractPathfinder):
+    def __init__(self, data: AbstractData, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, data, start, end, options)
+        self.start_neighbours = set(data.neighbours(self.start, self.options)) if self.start is not None else set()
+
+    def search(self):
+        self.info.frontiers = {'forward': 0, 'backward': 0}
+
+        if not self.reachable():
+            return self.build_empty_info()
+
+        forward = self.__frontier(self.start, self.end)
+        backward = self.__frontier(self.end, self.start)
+        best_cost, meeting = (0, self.start) if self.start == self.end else (math.inf, None)
+        settled = set()
+        self.info.expanded = 0
+
+        if self.data.boxes([self.end])[0].state != Box.State.SAFE:
+            forward['queue'].clear()
+
+        while forward['queue'] and backward['queue']:
+            frontier, opposite = (forward, backward) if len(forward['queue']) <= len(backward['queue']) else (backward, forward)
+            current = frontier['queue'].popitem()[0]
+
+            if current in settled:
+                continue
+
+            settled.add(current)
+            current_cost = frontier['cost'][current]
+
+            if (current_cost + self.__heuristic(current, frontier) >= best_cost or
+                    current_cost + opposite['queue'].topitem()[1] - self.__heuristic(current, opposite) >= best_cost):
+                continue
+
+            self.info.expanded += 1
+
+            for neighbour in self.__neighbours(current, frontier is backward):
+                if neighbour in settled:
+                    continue
+
+                cost = current_cost + self.data.cost(current, neighbour, self.options)
+
+                if neighbour not in frontier['visited'] or cost < frontier['cost'][neighbour]:
+                    frontier['queue'][neighbour] = cost + self.__heuristic(neighbour, frontier)
+                    frontier['cost'][neighbour] = cost
+                    frontier['visited'][neighbour] = current
+
+                    if neighbour in opposite['cost'] and cost + opposite['cost'][neighbour] < best_cost:
+                        best_cost = cost + opposite['cost'][neighbour]
+                        meeting = neighbour
+
+        self.info.frontiers = {'forward': len(forward['visited']), 'backward': len(backward['visited'])}
+        self.info.set_visited(self.data, list({**forward['visited'], **backward['visited']}.keys()))
+
+        if meeting is not None:
+            self.info.set_path(self.data, self.__join(forward['visited'], backward['visited'], meeting))
+            self.info.bound = 1.0
+
+        return self.info
+
+    def __heuristic(self, element, frontier):
+        return self.data.heuristic(element, frontier['target'], self.options)
+
+    def __frontier(self, source, target):
+        return {'queue': pqdict({source: self.data.heuristic(source, target, self.options)}),
+                'cost': {source: 0}, 'visited': {source: None}, 'target': target}
+
+    def __neighbours(self, current, backward):
+        if backward and current == self.start:
+            return []
+
+        neighbours = self.data.neighbours(current, self.options)
+
+        if backward and current in self.start_neighbours and self.start not in neighbours:
+            neighbours = list(neighbours) + [self.start]
+
+        return neighbours
+
+    @staticmethod
+    def __join(forward_visited, backward_visited, meeting):
+        path = []
+        current = meeting
+
+        while current is not None:
+            path.append(current)
+            current = backward_visited[current]
+
+        path.reverse()
+        current = forward_visited[meeting]
+
+        while current is not None:
+            path.append(current)
+            current = forward_visited[current]
+
+        return path
+
+
+class GraphAStar(AbstractPathfinder):
+    def __init__(self, graph: Graph, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, graph, start, end, options)
+
+    def search(self):
+        if not self.reachable():
+            return self.build_empty_info()
+
+        graph: Graph = self.data
+        priority_queue = [(0, self.start)]
+        cost_so_far = {self.start: 0}
+        visited = {self.start: None}
+        closed = set()
+        heuristic_weight = self.options.heuristic_weight
+        self.info.expanded = 0
+
+        while priority_queue:
+            current = heapq.heappop(priority_queue)[1]
+
+            if current == self.end:
+                break
+
+            if current in closed:
+                continue
+
+            closed.add(current)
+            self.info.expanded += 1
+
+            for neighbour, weight in graph.edges(current, self.options):
+                cost = cost_so_far[current] + weight
 
                 if neighbour not in visited or cost < cost_so_far[neighbour]:
-                    priority_queue[neighbour] = cost + self.data.heuristic(neighbour, self.end)
+                    heapq.heappush(priority_queue, (cost + heuristic_weight * graph.heuristic(neighbour, self.end, self.options), neighbour))
                     cost_so_far[neighbour] = cost
                     visited[neighbour] = current
 
         return self.build_info(visited)
 
 
+class DialAStar(AbstractPathfinder):
+    def __init__(self, graph: Graph, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, graph, start, end, options)
+
+    def search(self):
+        if not self.reachable():
+            return self.build_empty_info()
+
+        graph: Graph = self.data
+        priority_queue = BucketQueue()
+        priority_queue.push(self.start, 0)
+        cost_so_far = {self.start: 0}
+        visited = {self.start: None}
+        closed = set()
+        heuristic_weight = self.options.heuristic_weight * Config.Risk.RESOLUTION
+        self.info.expanded = 0
+
+        while priority_queue:
+            current = priority_queue.pop()
+
+            if current == self.end:
+                break
+
+            if current in closed:
+                continue
+
+            closed.add(current)
+            self.info.expanded += 1
+
+            for neighbour, weight in graph.quantized_edges(current, self.options):
+                cost = cost_so_far[current] + weight
+
+                if neighbour not in visited or cost < cost_so_far[neighbour]:
+                    priority_queue.push(neighbour, cost + int(heuristic_weight * graph.heuristic(neighbour, self.end, self.options)))
+                    cost_so_far[neighbour] = cost
+                    visited[neighbour] = current
+
+        info = self.build_info(visited)
+
+        if info.path is not None:
+            info.bound = self.options.heuristic_weight * graph.quantization_slack(self.options)
+
+        return info
+
+
+class FlowFieldPathfinder(AbstractPathfinder):
+    def __init__(self, fields: FlowFields, start, end):
+        super().__init__(type(self).__name__, fields.data, start, end, fields.options)
+        self.fields = fields
+
+    def search(self):
+        if not self.reachable():
+            return self.build_empty_info()
+
+        path = self.fields.field(self.end).path(self.start)
+
+        self.info.expanded = 0
+        self.info.set_visited(self.data, [])
+        self.info.set_path(self.data, path)
+
+        if path is not None:
+            self.info.bound = 1.0
+
+        return self.info
+
+
+class HPAStar(AbstractPathfinder):
+    class Segment(Enum):
+        PORTAL = 0
+        START = 1
+        END = 2
+
+    def __init__(self, hierarchy: Hierarchy, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, hierarchy.graph, start, end, options if options is not None else hierarchy.options)
+        self.hierarchy = hierarchy
+
+    def search(self):
+        if not self.reachable():
+            return self.build_empty_info()
+
+        graph: Graph = self.data
+        hierarchy = self.hierarchy
+        self.info.expanded = 0
+
+        assert hierarchy.distance_method == self.options.distance_method, 'Invalid options'
+
+        if not hierarchy.valid():
+            hierarchy.build()
+
+        if self.start == self.end:
+            return self.build_info({self.start: None})
+
+        if graph.states[self.end] != Box.State.SAFE.index:
+            return self.build_info({self.start: None})
+
+        start_clusters = {hierarchy.clusters[self.start]}
+        end_cluster = hierarchy.clusters[self.end]
+
+        if graph.states[self.start] != Box.State.SAFE.index:
+            start_clusters.update(hierarchy.clusters[neighbour] for neighbour in graph.neighbours(self.start, self.options))
+
+        start_targets = {entrance for cluster in start_clusters for entrance in hierarchy.entrances.get(cluster, [])}
+
+        if end_cluster in start_clusters:
+            start_targets.add(self.end)
+
+        start_costs, start_visited, start_expanded = hierarchy.search(self.start, start_clusters, start_targets)
+        end_costs, end_visited, end_expanded = hierarchy.search(self.end, {end_cluster}, set(hierarchy.entrances.get(end_cluster, [])))
+        self.info.expanded += start_expanded + end_expanded
+
+        priority_queue = [(0, self.start)]
+        cost_so_far = {self.start: 0}
+        visited = {self.start: None}
+        segments = {}
+        closed = set()
+
+        while priority_queue:
+            current = heapq.heappop(priority_queue)[1]
+
+            if current == self.end:
+                break
+
+            if current in closed:
+                continue
+
+            closed.add(current)
+            self.info.expanded += 1
+
+            for neighbour, cost, segment in self.__abstract_edges(current, start_costs, end_costs):
+                cost += cost_so_far[current]
+
+                if neighbour not in visited or cost < cost_so_far[neighbour]:
+                    heapq.heappush(priority_queue, (cost + self.options.heuristic_weight * graph.heuristic(neighbour, self.end, self.options), neighbour))
+                    cost_so_far[neighbour] = cost
+                    visited[neighbour] = current
+                    segments[neighbour] = segment
+
+        self.info.set_visited(graph, list({**start_visited, **end_visited, **visited}.keys()))
+
+        if self.end not in visited:
+            return self.info
+
+        path = self.__refine(visited, segments, start_visited, end_visited)
+
+        if Config.Hierarchy.CORRIDOR:
+            path = self.__corridor({hierarchy.clusters[element] for element in path})
+
+        self.info.set_path(graph, path)
+        self.info.bound = self.__bound(path)
+        return self.info
+
+    def __abstract_edges(self, current, start_costs, end_costs):
+        edges = [(neighbour, cost, HPAStar.Segment.PORTAL) for neighbour, cost in self.hierarchy.edges.get(current, {}).items()]
+
+        if current == self.start:
+            edges.extend((neighbour, cost, HPAStar.Segment.START) for neighbour, cost in start_costs.items() if neighbour != self.start)
+
+        if current in end_costs and current != self.end:
+            edges.append((self.end, end_costs[current], HPAStar.Segment.END))
+
+        return edges
+
+    def __refine(self, visited, segments, start_visited, end_visited):
+        path = [self.end]
+        current = self.end
+
+        while visited[current] is not None:
+            parent = visited[current]
+
+            match segments[current]:
+                case HPAStar.Segment.PORTAL:
+                    segment = self.hierarchy.paths[parent, current]
+                case HPAStar.Segment.START:
+                    segment = Hierarchy.build_path(start_visited, current)
+                case _:
+                    segment = Hierarchy.build_path(end_visited, parent)[::-1]
+
+            path.extend(segment[1:])
+            current = parent
+
+        return path
+
+    def __bound(self, path):
+        lower_bound = self.data.heuristic(self.start, self.end, self.options)
+
+        if lower_bound <= 0:
+            return None
+
+        cost = sum(self.data.cost(current, following, self.options) for current, following in itertools.pairwise(path))
+        return max(1.0, cost / lower_bound)
+
+    def __corridor(self, clusters: set[int]):
+        _, visited, expanded = self.hierarchy.search(self.start, clusters, {self.end}, self.end, self.options.heuristic_weight)
+        self.info.expanded += expanded
+
+        return Hierarchy.build_path(visited, self.end)
+
+
+class LazyThetaStar(AbstractPathfinder):
+    def __init__(self, data: AbstractData, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, data, start, end, options)
+        assert (data.data if isinstance(data, Graph) else data).risk is None, 'Invalid risk'
+        self.sight = Sight.shared(data)
+        self.points = {self.start: start, self.end: end}
+        self.start_neighbours = set(data.neighbours(self.start, self.options)) if self.start is not None else set()
+
+    def search(self):
+        self.info.sight_checks = 0
+
+        if not self.reachable():
+            return self.build_empty_info()
+
+        priority_queue = pqdict({self.start: 0})
+        cost_so_far = {self.start: 0}
+        visited = {self.start: None}
+        generators = {}
+        closed = set()
+        weight = self.options.heuristic_weight
+        self.info.expanded = 0
+
+        while priority_queue:
+            current = priority_queue.popitem()[0]
+            self.info.expanded += 1
+
+            if visited[current] is not None:
+                self.__set_vertex(current, generators[current], cost_so_far, visited, closed)
+
+            if current == self.end:
+                break
+
+            closed.add(current)
+            parent = visited[current] if visited[current] is not None else current
+
+            for neighbour in self.data.neighbours(current, self.options):
+                if neighbour in closed:
+                    continue
+
+                cost = cost_so_far[parent] + self.__cost(parent, neighbour)
+
+                if neighbour not in visited or cost < cost_so_far[neighbour]:
+                    priority_queue[neighbour] = cost + weight * self.__cost(neighbour, self.end)
+                    cost_so_far[neighbour] = cost
+                    visited[neighbour] = parent
+                    generators[neighbour] = current
+
+        self.info.set_visited(self.data, list(visited.keys()))
+
+        if self.end not in visited:
+            return self.info
+
+        path = self.build_path(visited)
+        self.info.set_path(self.data, path, [self.info.end] + [self.__point(element) for element in path[1:-1]] + [self.info.start])
+
+        options = SearchOptions(self.options.allow_diagonal, True, self.options.distance_method, self.options.heuristic_weight, True)
+        smoothed = AStar(self.data, self.info.start, self.info.end, options).search()
+        self.info.expanded += smoothed.expanded
+
+        if smoothed.path is not None and smoothed.trajectory_length() < self.info.trajectory_length():
+            self.info.set_path(self.data, smoothed.path, smoothed.points)
+
+        return self.info
+
+    def __set_vertex(self, current, generator, cost_so_far, visited, closed):
+        self.info.sight_checks += 1
+
+        if self.sight.visible(self.__point(visited[current]), self.__point(current)):
+            return
+
+        candidates = list(self.data.neighbours(current, self.options)) + [generator]
+
+        if current in self.start_neighbours:
+            candidates.append(self.start)
+
+        cost_so_far[current] = math.inf
+
+        for candidate in candidates:
+            if candidate not in closed:
+                continue
+
+            cost = cost_so_far[candidate] + self.__cost(candidate, current)
+
+            if cost < cost_so_far[current]:
+                cost_so_far[current] = cost
+                visited[current] = candidate
+
+    def __cost(self, start, end):
+        return self.data.distance(self.__point(start), self.__point(end), self.options)
+
+    def __point(self, element):
+        if element not in self.points:
+            self.points[element] = self.data.boxes([element])[0].center()
+
+        return self.points[element]
+
+
 class JPS(AbstractPathfinder):
-    def __init__(self, data: Grid, start, end):
-        super().__init__(type(self).__name__, data, start, end)
+    def __init__(self, data: Grid, start, end, options: SearchOptions | None = None):
+        super().__init__(type(self).__name__, data, start, end, options)
         assert isinstance(data, Grid)
+        assert data.risk is None, 'Invalid risk'
+        self.walkable = data.walkable_cells()
 
     def search(self):
-        pass
+        if not self.reachable():
+            return self.build_empty_info()
+
+        priority_queue = pqdict({self.start: 0})
+        cost_so_far = {self.start: 0}
+        visited = {self.start: None}
+        weight = self.options.heuristic_weight
+        self.info.expanded = 0
+
+        while priority_queue:
+            current = priority_queue.popitem()[0]
+            self.info.expanded += 1
+
+            if current == self.end:
+                break
+
+            for jump_point in self.__successors(current, visited[current]):
+                cost = cost_so_far[current] + self.data.cost(current, jump_point, self.options)
+
+                if jump_point not in visited or cost < cost_so_far[jump_point]:
+                    priority_queue[jump_point] = cost + weight * self.data.heuristic(jump_point, self.end, self.options)
+                    cost_so_far[jump_point] = cost
+                    visited[jump_point] = current
+
+        return self.build_info(visited)
+
+    def build_path(self, visited):
+        jump_points = super().build_path(visited)
+        path = jump_points[:1]
+
+        for current, following in itertools.pairwise(jump_points):
+            row, column = divmod(current, self.data.columns)
+            following_row, following_column = divmod(following, self.data.columns)
+            d_row, d_column = JPS.__sign(following_row - row), JPS.__sign(following_column - column)
+
+            while (row, column) != (following_row, following_column):
+                row, column = row + d_row, column + d_column
+                path.append(self.data.index(row, column))
+
+        return path
+
+    def __successors(self, current, parent):
+        row, column = divmod(current, self.data.columns)
+        successors = []
+
+        if parent is None:
+            directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+            if self.options.allow_diagonal:
+                directions.extend([(-1, -1), (-1, 1), (1, 1), (1, -1)])
+        else:
+            parent_row, parent_column = divmod(parent, self.data.columns)
+            d_row, d_column = JPS.__sign(row - parent_row), JPS.__sign(column - parent_column)
+            directions = self.__natural_directions(d_row, d_column) + self.__forced_directions(row, column, d_row, d_column)
+
+        for d_row, d_column in directions:
+            jump_point = self.__jump(row, column, d_row, d_column)
+
+            if jump_point is not None:
+                successors.append(jump_point)
+
+        return successors
+
+    def __jump(self, row, column, d_row, d_column):
+        while True:
+            row, column = row + d_row, column + d_column
+
+            if not self.__walkable(row, column):
+                return None
+
+            index = self.data.index(row, column)
+
+            if index == self.end or self.__forced_directions(row, column, d_row, d_column):
+                return index
+
+            if d_row != 0 and d_column != 0:
+                if self.__jump(row, column, d_row, 0) is not None or self.__jump(row, column, 0, d_column) is not None:
+                    return index
+
+            if not self.options.allow_diagonal and d_row == 0:
+                if self.__jump(row, column, -1, 0) is not None or self.__jump(row, column, 1, 0) is not None:
+                    return index
+
+    def __natural_directions(self, d_row, d_column):
+        if d_row != 0 and d_column != 0:
+            return [(d_row, 0), (0, d_column), (d_row, d_column)]
+
+        if not self.options.allow_diagonal and d_row == 0:
+            return [(0, d_column), (-1, 0), (1, 0)]
+
+        return [(d_row, d_column)]
+
+    def __forced_directions(self, row, column, d_row, d_column):
+        forced = []
+
+        if d_row != 0 and d_column != 0:
+            if not self.__walkable(row, column - d_column) and self.__walkable(row + d_row, column - d_column):
+                forced.append((d_row, -d_column))
+            if not self.__walkable(row - d_row, column) and self.__walkable(row - d_row, column + d_column):
+                forced.append((-d_row, d_column))
+
+        elif not self.options.allow_diagonal:
+            if d_row != 0:
+                for side in (-1, 1):
+                    if not self.__walkable(row - d_row, column + side) and self.__walkable(row, column + side):
+                        forced.append((0, side))
+
+        elif d_row == 0:
+            for side in (-1, 1):
+                if not self.__walkable(row + side, column) and self.__walkable(row + side, column + d_column):
+                    forced.append((side, d_column))
+
+        else:
+            for side in (-1, 1):
+                if not self.__walkable(row, column + side) and self.__walkable(row + d_row, column + side):
+                    forced.append((d_row, side))
+
+        return forced
+
+    def __walkable(self, row, column):
+        return 0 <= row < self.data.rows and 0 <= column < self.data.columns and self.walkable[row * self.data.columns + column]
+
+    @staticmethod
+    def __sign(value):
+        return (value > 0) - (value < 0)
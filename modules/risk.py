@@ -0,0 +1,117 @@
+import numpy as np
+
+from config import Config
+from modules.data import AbstractData, Box, Grid, Lattice, LinearQTree
+from modules.graph import Graph
+
+
+class RiskMap:
+    def __init__(self, data: AbstractData, layers: list[tuple[np.ndarray, float]]):
+        for layer, weight in layers:
+            assert layer.shape == data.pixels.shape[:2], 'Invalid risk layer'
+            assert weight >= 0, 'Invalid risk weight'
+
+        self.data = data
+        self.layers = layers
+        self.version = None
+        self.multipliers = np.empty(0)
+        self.values: list[float] = []
+        self.ids: dict | None = None
+
+        self.refresh()
+
+    def refresh(self):
+        if self.version == self.data.version:
+            return
+
+        nodes = Graph.nodes_of(self.data)
+        x, y, w, h = self.__boxes(nodes)
+        multipliers = np.ones(len(nodes))
+
+        for layer, weight in self.layers:
+            multipliers += weight * RiskMap.aggregate(layer, x, y, w, h)
+
+        self.multipliers = multipliers
+        self.values = multipliers.tolist()
+        self.ids = None if isinstance(self.data, (Grid, LinearQTree)) else {node: index for index, node in enumerate(nodes)}
+        self.version = self.data.version
+
+    def factor(self, start, end):
+        if self.version != self.data.version:
+            self.refresh()
+
+        if self.ids is not None:
+            start, end = self.ids[start], self.ids[end]
+
+        return (self.values[start] + self.values[end]) / 2
+
+    def multiplier(self, element):
+        if self.version != self.data.version:
+            self.refresh()
+
+        return self.values[element if self.ids is None else self.ids[element]]
+
+    def multipliers_of(self, elements):
+        self.refresh()
+
+        if self.ids is None:
+            return self.multipliers[np.asarray(elements, dtype=np.int64)]
+
+        return self.multipliers[[self.ids[element] for element in elements]]
+
+    @staticmethod
+    def aggregate(layer: np.ndarray, x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray):
+        lattice = Lattice(x, y, w, h)
+        xs, ys = lattice.xs, lattice.ys
+
+        window = layer[ys[0]:ys[-1], xs[0]:xs[-1]]
+        sums = np.add.reduceat(window, ys[:-1] - ys[0], axis=0, dtype=np.float64)
+        sums = np.add.reduceat(sums, xs[:-1] - xs[0], axis=1)
+
+        table = np.zeros((len(ys), len(xs)))
+        table[1:, 1:] = sums.cumsum(axis=0).cumsum(axis=1)
+
+        totals = (table[lattice.last_rows, lattice.last_columns] - table[lattice.first_rows, lattice.last_columns] -
+                  table[lattice.last_rows, lattice.first_columns] + table[lattice.first_rows, lattice.first_columns])
+
+        return totals / (w * h)
+
+    @staticmethod
+    def proximity(pixels: np.ndarray, radius):
+        unsafe = Box.color_mask(pixels, Config.Color.UNSAFE)
+        height, width = unsafe.shape
+
+        table = np.zeros((height + 1, width + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(unsafe, axis=0, dtype=np.int32), axis=1, out=table[1:, 1:])
+
+        columns = np.arange(width)
+        left, right = np.clip(columns - radius, 0, width), np.clip(columns + radius + 1, 0, width)
+        layer = np.empty((height, width), dtype=np.float32)
+
+        for top in range(0, height, Config.Occupancy.TILE):
+            rows = np.arange(top, min(top + Config.Occupancy.TILE, height))
+            first, last = np.clip(rows - radius, 0, height), np.clip(rows + radius + 1, 0, height)
+
+            counts = (table[np.ix_(last, right)] - table[np.ix_(first, right)] -
+                      table[np.ix_(last, left)] + table[np.ix_(first, left)])
+
+            layer[rows] = counts / ((last - first)[:, np.newaxis] * (right - left)[np.newaxis, :])
+
+        return layer
+
+    def __boxes(self, nodes):
+        if isinstance(self.data, Grid):
+            size = self.data.pixels.shape[1] // self.data.columns
+            rows, columns = np.divmod(np.arange(len(nodes)), self.data.columns)
+
+            return columns * size, rows * size, np.full(len(nodes), size), np.full(len(nodes), size)
+
+        if isinstance(self.data, LinearQTree):
+            nodes = np.asarray(nodes, dtype=np.int64)
+            return (self.data.x[nodes].astype(np.int64), self.data.y[nodes].astype(np.int64),
+                    self.data.w[nodes].astype(np.int64), self.data.h[nodes].astype(np.int64))
+
+        boxes = self.data.boxes(nodes)
+
+        return (np.array([box.x for box in boxes], dtype=np.int64), np.array([box.y for box in boxes], dtype=np.int64),
+                np.array([box.w for box in boxes], dtype=np.int64), np.array([box.h for box in boxes], dtype=np.int64))
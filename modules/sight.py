@@ -0,0 +1,78 @@
+import math
+import weakref
+from bisect import bisect_right
+
+import numpy as np
+
+from modules.data import AbstractData, Box, Grid, Lattice, LinearQTree
+
+
+class Sight:
+    shared_sights = weakref.WeakKeyDictionary()
+
+    def __init__(self, data: AbstractData):
+        self.version = data.version
+
+        if isinstance(data, Grid):
+            size = data.pixels.shape[1] // data.columns
+            xs = np.arange(data.columns + 1) * size
+            ys = np.arange(data.rows + 1) * size
+            raster = data.walkable_mask().reshape(data.rows, data.columns)
+        else:
+            if isinstance(data, LinearQTree):
+                lattice = Lattice(data.x, data.y, data.w, data.h)
+                safe = data.state == Box.State.SAFE.index
+            else:
+                boxes = data.boxes()
+                lattice = Lattice.from_boxes(boxes)
+                safe = np.array([box.state == Box.State.SAFE for box in boxes], dtype=bool)
+
+            xs, ys = lattice.xs, lattice.ys
+            raster = lattice.raster(safe, False, np.flatnonzero(safe).tolist())
+
+        self.xs = xs.tolist()
+        self.ys = ys.tolist()
+        self.raster = raster.tolist()
+
+    @staticmethod
+    def shared(data: AbstractData):
+        sight = Sight.shared_sights.get(data)
+
+        if sight is None or sight.version != data.version:
+            sight = Sight(data)
+            Sight.shared_sights[data] = sight
+
+        return sight
+
+    def visible(self, p0, p1):
+        xs, ys, raster = self.xs, self.ys, self.raster
+        x0, y0 = p0[0] + 0.5, p0[1] + 0.5
+        x1, y1 = p1[0] + 0.5, p1[1] + 0.5
+
+        if not (xs[0] <= min(x0, x1) and max(x0, x1) < xs[-1] and ys[0] <= min(y0, y1) and max(y0, y1) < ys[-1]):
+            return False
+
+        column, row = bisect_right(xs, x0) - 1, bisect_right(ys, y0) - 1
+        end_column, end_row = bisect_right(xs, x1) - 1, bisect_right(ys, y1) - 1
+        dx, dy = x1 - x0, y1 - y0
+        step_column, step_row = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+
+        while raster[row][column]:
+            if row == end_row and column == end_column:
+                return True
+
+            t_x = (xs[column + (step_column > 0)] - x0) / dx if dx else math.inf
+            t_y = (ys[row + (step_row > 0)] - y0) / dy if dy else math.inf
+
+            if t_x < t_y:
+                column += step_column
+            elif t_y < t_x:
+                row += step_row
+            else:
+                if not raster[row][column + step_column] or not raster[row + step_row][column]:
+                    return False
+
+                column += step_column
+                row += step_row
+
+        return False
@@ -0,0 +1,87 @@
+import numpy as np
+
+from config import Config
+from modules.data import Box
+
+
+class Smoothing:
+
+    @staticmethod
+    def boxes(points, boxes: list[Box]):
+        if len(points) < 2:
+            return list(points)
+
+        count = len(points) - 1
+        segments = np.array(points, dtype=np.float64)
+        x0, y0 = segments[:-1, 0], segments[:-1, 1]
+        x1, y1 = segments[1:, 0], segments[1:, 1]
+
+        x = np.array([box.x for box in boxes[:count]], dtype=np.float64)
+        y = np.array([box.y for box in boxes[:count]], dtype=np.float64)
+        right = x + np.array([box.w for box in boxes[:count]], dtype=np.float64) - 1
+        bottom = y + np.array([box.h for box in boxes[:count]], dtype=np.float64) - 1
+
+        n_valid, n_x = Smoothing.__crossing(x0, y0, x1, y1, y, x, right)
+        e_valid, e_y = Smoothing.__crossing(y0, x0, y1, x1, right, y, bottom)
+        s_valid, s_x = Smoothing.__crossing(x0, y0, x1, y1, bottom, x, right)
+        w_valid, w_y = Smoothing.__crossing(y0, x0, y1, x1, x, y, bottom)
+
+        valid = np.stack([n_valid, e_valid, s_valid, w_valid], axis=1)
+        xs = np.stack([n_x, right, s_x, x], axis=1)
+        ys = np.stack([y, e_y, bottom, w_y], axis=1)
+
+        found = valid.any(axis=1) & ((x0 != x1) | (y0 != y1))
+        edges = np.argmax(valid, axis=1)[found]
+        rows = np.flatnonzero(found)
+
+        intersections = zip(np.rint(xs[rows, edges]).astype(np.int64).tolist(),
+                            np.rint(ys[rows, edges]).astype(np.int64).tolist())
+
+        return [points[0]] + list(intersections) + [points[-1]]
+
+    @staticmethod
+    def sight(pixels: np.ndarray, points):
+        if len(points) < 3:
+            return list(points)
+
+        pulled = [points[0]]
+        anchor = 0
+
+        while anchor < len(points) - 1:
+            following = len(points) - 1
+
+            while following > anchor + 1 and not Smoothing.visible(pixels, points[anchor], points[following]):
+                following -= 1
+
+            pulled.append(points[following])
+            anchor = following
+
+        return pulled
+
+    @staticmethod
+    def visible(pixels: np.ndarray, p0, p1):
+        (x0, y0), (x1, y1) = p0, p1
+        count = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+
+        xs = np.rint(np.linspace(x0, x1, count)).astype(np.int64)
+        ys = np.rint(np.linspace(y0, y1, count)).astype(np.int64)
+
+        if xs.min() < 0 or ys.min() < 0 or xs.max() >= pixels.shape[1] or ys.max() >= pixels.shape[0]:
+            return False
+
+        return not Box.color_mask(pixels[ys, xs][np.newaxis], Config.Color.UNSAFE).any()
+
+    @staticmethod
+    def __crossing(a0, b0, a1, b1, line, low, high):
+        delta = b1 - b0
+        parallel = delta == 0
+
+        t = np.where(parallel, 0, (line - b0) / np.where(parallel, 1, delta))
+
+        crossing = np.where(parallel, np.clip(a0, low, high), a0 + t * (a1 - a0))
+
+        valid = np.where(parallel,
+                         (b0 == line) & (np.minimum(a0, a1) <= high) & (np.maximum(a0, a1) >= low),
+                         (t >= 0) & (t <= 1) & (crossing >= low) & (crossing <= high))
+
+        return valid, crossing
@@ -0,0 +1,199 @@
+import hashlib
+import os
+
+import numpy as np
+
+from config import Config
+from modules.data import AbstractData, Box, Grid, QTree, LinearQTree
+from modules.graph import Graph
+from modules.landmarks import Landmarks
+from modules.options import SearchOptions
+
+
+class Storage:
+    VERSION = 1
+
+    def __init__(self, path=Config.Storage.PATH):
+        self.path = path
+
+    def grid(self, image_path, pixels: np.ndarray) -> Grid:
+        file_path = self.__file_path(image_path, Grid, Config.Grid.MIN_SIZE)
+
+        if os.path.exists(file_path):
+            return Storage.load_grid(file_path, pixels)
+
+        grid = Grid(pixels)
+        Storage.save_grid(grid, file_path)
+
+        return grid
+
+    def qtree(self, image_path, pixels: np.ndarray) -> QTree:
+        file_path = self.__file_path(image_path, QTree, Config.QTree.MIN_SIZE)
+
+        if os.path.exists(file_path):
+            return Storage.load_qtree(file_path, pixels)
+
+        qtree = QTree(pixels, 0, 0, pixels.shape[1], pixels.shape[0])
+        qtree.divide()
+        Storage.save_qtree(qtree, file_path)
+
+        return qtree
+
+    def linear_qtree(self, image_path, pixels: np.ndarray) -> LinearQTree:
+        file_path = self.__file_path(image_path, LinearQTree, Config.QTree.MIN_SIZE)
+
+        if os.path.exists(file_path):
+            return Storage.load_linear_qtree(file_path, pixels)
+
+        qtree = LinearQTree(pixels, 0, 0, pixels.shape[1], pixels.shape[0])
+        qtree.divide()
+        Storage.save_linear_qtree(qtree, file_path)
+
+        return qtree
+
+    def graph(self, image_path, data: AbstractData, options: SearchOptions | None = None) -> Graph:
+        options = options if options is not None else SearchOptions.of(data)
+        min_size = Config.Grid.MIN_SIZE if isinstance(data, Grid) else Config.QTree.MIN_SIZE
+        file_path = self.__file_path(image_path, Graph, type(data).__name__, min_size, options.allow_diagonal)
+
+        if os.path.exists(file_path):
+            return Storage.load_graph(file_path, data, options)
+
+        graph = Graph(data, options=options)
+        Storage.save_graph(graph, file_path)
+
+        return graph
+
+    def landmarks(self, image_path, graph: Graph) -> Landmarks:
+        min_size = Config.Grid.MIN_SIZE if isinstance(graph.data, Grid) else Config.QTree.MIN_SIZE
+        file_path = self.__file_path(image_path, Landmarks, type(graph.data).__name__, min_size, graph.allow_diagonal,
+                                     graph.distance_method.name, Config.Landmarks.COUNT, Storage.__risk(graph.data))
+
+        if os.path.exists(file_path):
+            return Storage.load_landmarks(file_path, graph)
+
+        landmarks = Landmarks(graph)
+        Storage.save_landmarks(landmarks, file_path)
+
+        return landmarks
+
+    @staticmethod
+    def save_grid(grid: Grid, file_path):
+        Storage.__save(file_path, states=grid.states)
+
+    @staticmethod
+    def load_grid(file_path, pixels: np.ndarray) -> Grid:
+        with np.load(file_path) as arrays:
+            return Grid(pixels, arrays['states'])
+
+    @staticmethod
+    def save_qtree(qtree: QTree, file_path):
+        nodes = []
+        candidates = [qtree]
+
+        while candidates:
+            node = candidates.pop()
+            nodes.append((node.box.x, node.box.y, node.box.w, node.box.h, node.box.state.index, node.is_leaf()))
+            candidates.extend(reversed(node.children))
+
+        x, y, w, h, state, leaf = zip(*nodes)
+
+        Storage.__save(file_path,
+                       x=np.array(x, dtype=np.int32),
+                       y=np.array(y, dtype=np.int32),
+                       w=np.array(w, dtype=np.int32),
+                       h=np.array(h, dtype=np.int32),
+                       state=np.array(state, dtype=np.uint8),
+                       leaf=np.array(leaf, dtype=bool))
+
+    @staticmethod
+    def load_qtree(file_path, pixels: np.ndarray) -> QTree:
+        with np.load(file_path) as arrays:
+            columns = [arrays[name].tolist() for name in ['x', 'y', 'w', 'h', 'state', 'leaf']]
+
+        states = list(Box.State)
+        root = None
+        parents: list[QTree] = []
+
+        for x, y, w, h, state, leaf in zip(*columns):
+            node = QTree(pixels, x, y, w, h)
+            node.box.state = states[state]
+
+            if parents:
+                parent = parents[-1]
+                parent.add_child(node)
+
+                if len(parent.children) == len(QTree.Child):
+                    parents.pop()
+            else:
+                root = node
+
+            if not leaf:
+                parents.append(node)
+
+        return root
+
+    @staticmethod
+    def save_linear_qtree(qtree: LinearQTree, file_path):
+        Storage.__save(file_path, x=qtree.x, y=qtree.y, w=qtree.w, h=qtree.h,
+                       state=qtree.state, depth=qtree.depth, code=qtree.code)
+
+    @staticmethod
+    def load_linear_qtree(file_path, pixels: np.ndarray) -> LinearQTree:
+        qtree = LinearQTree(pixels, 0, 0, pixels.shape[1], pixels.shape[0])
+
+        with np.load(file_path) as arrays:
+            qtree.set_leaves(*(arrays[name] for name in ['x', 'y', 'w', 'h', 'state', 'depth', 'code']))
+
+        return qtree
+
+    @staticmethod
+    def save_graph(graph: Graph, file_path):
+        Storage.__save(file_path, indptr=graph.indptr, indices=graph.indices)
+
+    @staticmethod
+    def load_graph(file_path, data: AbstractData, options: SearchOptions | None = None) -> Graph:
+        with np.load(file_path) as arrays:
+            return Graph(data, (arrays['indptr'], arrays['indices']), options)
+
+    @staticmethod
+    def save_landmarks(landmarks: Landmarks, file_path):
+        Storage.__save(file_path, landmarks=landmarks.landmarks, distances=landmarks.distances)
+
+    @staticmethod
+    def load_landmarks(file_path, graph: Graph) -> Landmarks:
+        with np.load(file_path) as arrays:
+            return Landmarks(graph, (arrays['landmarks'], arrays['distances']))
+
+    @staticmethod
+    def digest(file_path):
+        digest = hashlib.blake2b(digest_size=16)
+
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def __risk(data: AbstractData):
+        if data.risk is None:
+            return None
+
+        data.risk.refresh()
+        return hashlib.blake2b(data.risk.multipliers.tobytes(), digest_size=16).hexdigest()
+
+    def __file_path(self, image_path, data_type, *parameters):
+        key = hashlib.blake2b(digest_size=16)
+        key.update(Storage.digest(image_path).encode())
+        key.update(repr((Storage.VERSION, data_type.__name__) + parameters).encode())
+
+        return os.path.join(self.path, f'{data_type.__name__.lower()}_{key.hexdigest()}.npz')
+
+    @staticmethod
+    def __save(file_path, **arrays):
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        temporary_path = f'{file_path}.tmp.npz'
+
+        np.savez(temporary_path, **arrays)
+        os.replace(temporary_path, file_path)